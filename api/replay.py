@@ -0,0 +1,212 @@
+"""Record/replay transports for deterministic Scryfall API runs."""
+import base64
+import gzip
+import hashlib
+import json
+import math
+import random
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+
+CASSETTE_VERSION = 1
+
+
+def _request_key(request: httpx.Request) -> Tuple[str, str, str]:
+    """Key a request by method, URL (normalized query order) and body digest."""
+    params = sorted(request.url.params.multi_items())
+    url = str(request.url.copy_with(params=params))
+    body = request.read()
+    digest = hashlib.sha1(body).hexdigest() if body else ""
+    return request.method, url, digest
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """
+    Transport that forwards requests and records the responses.
+
+    The cassette is written when the transport is closed, which happens
+    when the owning httpx.Client (or ScryfallAPI) is closed.
+    """
+
+    def __init__(self, cassette_path: str, transport: Optional[httpx.BaseTransport] = None):
+        """
+        Initialize the recorder.
+
+        Args:
+            cassette_path: Path of the gzip-compressed cassette to write
+            transport: Transport used for the real requests
+        """
+        self.cassette_path = cassette_path
+        self.transport = transport or httpx.HTTPTransport()
+        self.entries: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self.transport.handle_request(request)
+        content = response.read()
+        elapsed = time.perf_counter() - start
+        response.close()
+
+        try:
+            body, encoding = content.decode("utf-8"), "text"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+
+        method, url, digest = _request_key(request)
+        self.entries.append({
+            "method": method,
+            "url": url,
+            "request_digest": digest,
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type"),
+            "body": body,
+            "encoding": encoding,
+            "offset": start - self._started,
+            "elapsed": elapsed,
+        })
+
+        headers = {}
+        if response.headers.get("content-type"):
+            headers["content-type"] = response.headers["content-type"]
+        return httpx.Response(response.status_code, headers=headers,
+                              content=content, request=request)
+
+    def close(self):
+        self.transport.close()
+        self.save()
+
+    def save(self):
+        """Write all recorded entries to the cassette file."""
+        with gzip.open(self.cassette_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CASSETTE_VERSION,
+                                "entries": len(self.entries)}) + "\n")
+            for entry in self.entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    Transport that serves responses from a recorded cassette.
+
+    Responses for the same request are served in recorded order, cycling
+    when a request is made more often than it was recorded. Requests that
+    were never recorded get a Scryfall-style 404 error.
+
+    Latency can follow the recording, be disabled, or be drawn from a
+    seeded distribution, and is divided by ``speedup``:
+
+    - ``"recorded"``: sleep for the recorded response time
+    - ``"none"``: respond immediately
+    - ``"fixed:MS"``: always sleep MS milliseconds
+    - ``"uniform:LOW:HIGH"``: uniform between LOW and HIGH milliseconds
+    - ``"lognormal:MEDIAN:SIGMA"``: log-normal with the given median (ms)
+    """
+
+    def __init__(self, cassette_path: str, speedup: float = 1.0,
+                 latency: str = "recorded", seed: int = 0):
+        """
+        Initialize the replayer.
+
+        Args:
+            cassette_path: Path of the cassette to replay
+            speedup: Factor by which all latencies are divided
+            latency: Latency model (see class docstring)
+            seed: Random seed for latency distributions
+        """
+        if speedup <= 0:
+            raise ValueError(f"Replay speedup must be greater than 0, got {speedup}")
+        self.speedup = speedup
+        self.responses: Dict[Tuple[str, str, str], Deque[Dict[str, Any]]] = defaultdict(deque)
+        self.served = 0
+        self.misses = 0
+        self.simulated_latency = 0.0
+        self._rng = random.Random(seed)
+        self._latency = self._parse_latency(latency)
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+        with gzip.open(cassette_path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version: {header.get('version')}")
+            for line in f:
+                entry = json.loads(line)
+                key = (entry["method"], entry["url"], entry["request_digest"])
+                self.responses[key].append(entry)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._started is None:
+            self._started = time.perf_counter()
+
+        queue = self.responses.get(_request_key(request))
+
+        if not queue:
+            self.misses += 1
+            self._finished = time.perf_counter()
+            return httpx.Response(404, request=request, json={
+                "object": "error",
+                "status": 404,
+                "code": "not_found",
+                "details": "Request was not recorded in the cassette",
+            })
+
+        entry = queue[0]
+        queue.rotate(-1)
+
+        delay = self._latency(entry) / self.speedup
+        if delay > 0:
+            time.sleep(delay)
+        self.simulated_latency += delay
+        self.served += 1
+
+        if entry["encoding"] == "base64":
+            content = base64.b64decode(entry["body"])
+        else:
+            content = entry["body"].encode("utf-8")
+
+        headers = {}
+        if entry.get("content_type"):
+            headers["content-type"] = entry["content_type"]
+        self._finished = time.perf_counter()
+        return httpx.Response(entry["status"], headers=headers,
+                              content=content, request=request)
+
+    def summary(self) -> str:
+        """
+        Summarize replayed requests and throughput.
+
+        Throughput is measured from the first request to the last response,
+        so idle time before exit (e.g. in the TUI) is not counted.
+        """
+        elapsed = self._finished - self._started if self._started else 0.0
+        rate = self.served / elapsed if elapsed > 0 else 0.0
+        return (f"Replayed {self.served} request(s), {self.misses} miss(es) "
+                f"in {elapsed:.2f}s ({rate:.1f} req/s, "
+                f"{self.simulated_latency:.2f}s simulated latency)")
+
+    def _parse_latency(self, spec: str) -> Callable[[Dict[str, Any]], float]:
+        """Build a latency function (returning seconds) from a latency spec."""
+        name, *args = spec.split(":")
+        try:
+            values = [float(arg) for arg in args]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+        if name == "recorded" and not values:
+            return lambda entry: entry["elapsed"]
+        if name == "none" and not values:
+            return lambda entry: 0.0
+        if name == "fixed" and len(values) == 1:
+            return lambda entry: values[0] / 1000
+        if name == "uniform" and len(values) == 2:
+            return lambda entry: self._rng.uniform(values[0], values[1]) / 1000
+        if name == "lognormal" and len(values) == 2 and values[0] > 0:
+            mu = math.log(values[0] / 1000)
+            return lambda entry: self._rng.lognormvariate(mu, values[1])
+
+        raise ValueError(f"Invalid latency spec: {spec}")
@@ -1,15 +1,97 @@
 """Scryfall API integration for fetching MTG card data."""
+import time
 import httpx
-from typing import Optional, List, Dict, Any
+from contextlib import closing
+from itertools import islice
+from typing import Optional, List, Dict, Any, Tuple, Iterator, NamedTuple
+
+from utils.json_stream import iter_json_array
+
+
+# Scryfall price fields (one per finish/currency) and their display labels,
+# in order of preference for a card's primary price
+PRICE_FIELDS = {
+    "usd": "USD",
+    "usd_foil": "USD (Foil)",
+    "eur": "EUR",
+    "usd_etched": "USD (Etched)",
+    "eur_foil": "EUR (Foil)",
+    "tix": "TIX",
+}
+PRIMARY_PRICE_FIELDS = ("usd", "usd_foil", "eur")
+
+
+def extract_card_data(card_raw: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract relevant card data from Scryfall response.
+    
+    Args:
+        card_raw: Raw card data from Scryfall
+        
+    Returns:
+        Simplified card dictionary
+    """
+    prices = card_raw.get("prices") or {}
+    
+    # Prefer USD price, fallback to USD foil, then EUR
+    price = None
+    price_type = None
+    
+    for field in PRIMARY_PRICE_FIELDS:
+        if prices.get(field):
+            price = float(prices[field])
+            price_type = PRICE_FIELDS[field]
+            break
+    
+    return {
+        "id": card_raw.get("id"),
+        "name": card_raw.get("name"),
+        "set": card_raw.get("set_name"),
+        "set_code": card_raw.get("set"),
+        "collector_number": card_raw.get("collector_number"),
+        "price": price,
+        "price_type": price_type,
+        "scryfall_uri": card_raw.get("scryfall_uri"),
+    }
+
+
+class CardRecord(NamedTuple):
+    """Compact card record with the same fields as extract_card_data()."""
+    id: Optional[str]
+    name: Optional[str]
+    set: Optional[str]
+    set_code: Optional[str]
+    collector_number: Optional[str]
+    price: Optional[float]
+    price_type: Optional[str]
+    scryfall_uri: Optional[str]
 
 
 class ScryfallAPI:
     """Interface for Scryfall API operations."""
     
     BASE_URL = "https://api.scryfall.com"
+    CACHE_SIZE = 1024
+    # Maximum number of identifiers per /cards/collection request
+    COLLECTION_BATCH_SIZE = 75
     
-    def __init__(self):
-        self.client = httpx.Client(timeout=10.0)
+    def __init__(self, cache_ttl: float = 0.0, transport: Optional[httpx.BaseTransport] = None,
+                 name_index=None):
+        """
+        Initialize the API client.
+        
+        Args:
+            cache_ttl: Seconds to cache search and card lookups
+                (0 disables caching)
+            transport: Optional httpx transport, e.g. a RecordingTransport
+                or ReplayTransport from api.replay
+            name_index: Optional NameIndex; names it knows exactly are
+                looked up with exact instead of fuzzy matching
+        """
+        self.client = httpx.Client(timeout=10.0, transport=transport)
+        self.name_index = name_index
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
     
     def search_cards(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
@@ -22,22 +104,64 @@ class ScryfallAPI:
         Returns:
             List of card dictionaries with relevant data
         """
-        try:
-            response = self.client.get(
-                f"{self.BASE_URL}/cards/search",
-                params={"q": query, "order": "name"}
-            )
-            response.raise_for_status()
-            data = response.json()
+        cached = self._cache_get(("search", f"{max_results}:{query}"))
+        if cached is not None:
+            return cached
+        
+        cards = [card._asdict() for card in self.search_card_records(query, max_results)]
+        
+        self._cache_set(("search", f"{max_results}:{query}"), cards)
+        return cards
+    
+    def search_card_records(self, query: str, max_results: int = 10) -> List[CardRecord]:
+        """
+        Get the first search results as compact records.
+        
+        Args:
+            query: The search query (card name)
+            max_results: Maximum number of results to return
             
-            cards = []
-            for card in data.get("data", [])[:max_results]:
-                cards.append(self._extract_card_data(card))
+        Returns:
+            List of CardRecord
+        """
+        with closing(self.iter_search(query)) as results:
+            return list(islice(results, max_results))
+    
+    def iter_search(self, query: str, order: str = "name") -> Iterator[CardRecord]:
+        """
+        Lazily iterate over all search results, following pagination.
+        
+        Each page is parsed as it streams in and the next page is only
+        requested once the current one is exhausted, so stopping early (or
+        closing the generator) avoids downloading the rest.
+        
+        Args:
+            query: The search query (Scryfall search syntax)
+            order: Sort order for the results
             
-            return cards
-        except httpx.HTTPError as e:
+        Yields:
+            CardRecord for each matching card
+        """
+        url = f"{self.BASE_URL}/cards/search"
+        params = {"q": query, "order": order}
+        
+        try:
+            while url:
+                with self.client.stream("GET", url, params=params) as response:
+                    # Scryfall answers 404 when nothing matches
+                    if response.status_code == 404:
+                        return
+                    response.raise_for_status()
+                    
+                    page = {}
+                    for card in iter_json_array(response.iter_text(), "data", page):
+                        yield CardRecord(**self._extract_card_data(card))
+                
+                url = page.get("next_page") if page.get("has_more") else None
+                # next_page already carries the query string
+                params = None
+        except (httpx.HTTPError, ValueError) as e:
             print(f"Error searching cards: {e}")
-            return []
     
     def get_card_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -49,14 +173,34 @@ class ScryfallAPI:
         Returns:
             Card dictionary or None if not found
         """
+        cached = self._cache_get(("named", name))
+        if cached is not None:
+            return cached
+        
+        # Names the local index knows exactly (up to case, accents and
+        # punctuation) only need an exact lookup. Anything else, including
+        # names the index has never seen, goes to Scryfall's fuzzy matching,
+        # since the saved index can be days old.
+        attempts = []
+        if self.name_index is not None:
+            known = self.name_index.exact(name)
+            if known:
+                attempts.append({"exact": known})
+        attempts.append({"fuzzy": name})
+        
         try:
-            response = self.client.get(
-                f"{self.BASE_URL}/cards/named",
-                params={"fuzzy": name}
-            )
+            for params in attempts:
+                response = self.client.get(
+                    f"{self.BASE_URL}/cards/named",
+                    params=params
+                )
+                if response.status_code != 404 or params is attempts[-1]:
+                    break
             response.raise_for_status()
             card_data = response.json()
-            return self._extract_card_data(card_data)
+            card = self._extract_card_data(card_data)
+            self._cache_set(("named", name), card)
+            return card
         except httpx.HTTPError as e:
             print(f"Error fetching card '{name}': {e}")
             return None
@@ -78,42 +222,79 @@ class ScryfallAPI:
                 cards.append(card)
         return cards
     
-    def _extract_card_data(self, card_raw: Dict[str, Any]) -> Dict[str, Any]:
+    def get_cards_by_ids(self, scryfall_ids: List[str]) -> List[Dict[str, Any]]:
         """
-        Extract relevant card data from Scryfall response.
+        Get multiple printings by Scryfall ID.
+        
+        Uses the /cards/collection endpoint, which resolves up to 75 exact
+        identifiers per request.
         
         Args:
-            card_raw: Raw card data from Scryfall
+            scryfall_ids: List of Scryfall IDs
+            
+        Returns:
+            List of card dictionaries (IDs that were not found are skipped)
+        """
+        cards = []
+        for start in range(0, len(scryfall_ids), self.COLLECTION_BATCH_SIZE):
+            batch = scryfall_ids[start:start + self.COLLECTION_BATCH_SIZE]
+            try:
+                response = self.client.post(
+                    f"{self.BASE_URL}/cards/collection",
+                    json={"identifiers": [{"id": scryfall_id} for scryfall_id in batch]}
+                )
+                response.raise_for_status()
+                data = response.json()
+            except httpx.HTTPError as e:
+                print(f"Error fetching card collection: {e}")
+                continue
             
+            for card in data.get("data", []):
+                cards.append(self._extract_card_data(card))
+        return cards
+    
+    def get_card_names(self) -> List[str]:
+        """
+        Get the names of all cards from Scryfall's card name catalog.
+        
         Returns:
-            Simplified card dictionary
-        """
-        prices = card_raw.get("prices", {})
-        
-        # Prefer USD price, fallback to USD foil, then EUR
-        price = None
-        price_type = None
-        
-        if prices.get("usd"):
-            price = float(prices["usd"])
-            price_type = "USD"
-        elif prices.get("usd_foil"):
-            price = float(prices["usd_foil"])
-            price_type = "USD (Foil)"
-        elif prices.get("eur"):
-            price = float(prices["eur"])
-            price_type = "EUR"
-        
-        return {
-            "id": card_raw.get("id"),
-            "name": card_raw.get("name"),
-            "set": card_raw.get("set_name"),
-            "set_code": card_raw.get("set"),
-            "collector_number": card_raw.get("collector_number"),
-            "price": price,
-            "price_type": price_type,
-            "scryfall_uri": card_raw.get("scryfall_uri"),
-        }
+            List of card names (empty on error)
+        """
+        try:
+            with self.client.stream("GET", f"{self.BASE_URL}/catalog/card-names") as response:
+                response.raise_for_status()
+                return list(iter_json_array(response.iter_text(), "data"))
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error fetching card name catalog: {e}")
+            return []
+    
+    def _extract_card_data(self, card_raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract relevant card data from Scryfall response."""
+        return extract_card_data(card_raw)
+    
+    def _cache_get(self, key: Tuple[str, str]) -> Any:
+        """Get a cached value, or None if missing or expired."""
+        if not self.cache_ttl:
+            return None
+        
+        entry = self._cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    def _cache_set(self, key: Tuple[str, str], value: Any):
+        """Cache a value for cache_ttl seconds."""
+        if not self.cache_ttl:
+            return
+        
+        now = time.monotonic()
+        if len(self._cache) >= self.CACHE_SIZE:
+            # Drop expired entries first, then the oldest ones
+            self._cache = {k: v for k, v in self._cache.items() if v[0] >= now}
+            while len(self._cache) >= self.CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+        
+        self._cache[key] = (now + self.cache_ttl, value)
     
     def close(self):
         """Close the HTTP client."""
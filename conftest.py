@@ -0,0 +1 @@
+"""Makes the project root importable when running pytest."""
@@ -0,0 +1,575 @@
+"""Columnar archive for cold price history partitions."""
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+STRING_COLUMNS = ("card_name", "scryfall_id", "price_type")
+
+
+class PriceArchive:
+    """
+    Moves cold monthly partitions of price_history out of SQLite.
+
+    Partitions are written as uncompressed Arrow IPC (Feather v2) files
+    when pyarrow is installed and as NumPy arrays otherwise; both are read
+    memory-mapped without copying. Parquet parts written by earlier
+    versions are still read (decoded into memory). Each archive run adds a
+    new part under ``<archive_dir>/month=YYYY-MM/`` so existing parts are
+    never rewritten. Parts keep the original history ids, so rows left in
+    SQLite by an interrupted run are recognized instead of archived twice.
+    """
+
+    PAGE_CACHE_SIZE = 32
+
+    def __init__(self, db, archive_dir: str = "data/archive"):
+        """
+        Initialize the archive.
+
+        Args:
+            db: CardDatabase instance holding the live price_history table
+            archive_dir: Directory where archived partitions are stored
+        """
+        self.db = db
+        self.archive_dir = Path(archive_dir)
+        # Archived rows of recently paged printings, keyed with the parts
+        # they were read from
+        self._page_cache: "OrderedDict[Any, List[Dict[str, Any]]]" = OrderedDict()
+
+    @property
+    def available(self) -> bool:
+        """Whether a columnar backend (pyarrow or numpy) is installed."""
+        return pa is not None or np is not None
+
+    def cold_partitions(self, keep_months: int = 3) -> List[str]:
+        """
+        List months in the live table that are old enough to archive.
+
+        Args:
+            keep_months: Number of most recent months to keep in SQLite
+
+        Returns:
+            Sorted list of "YYYY-MM" partition keys
+        """
+        cutoff = f"{self._cutoff_month(keep_months)}-01"
+        cursor = self.db.conn.cursor()
+        months = []
+        start = ""
+
+        # Jump from month to month on the recorded_at index instead of
+        # scanning the table
+        while True:
+            cursor.execute("""
+                SELECT MIN(recorded_at) AS first FROM price_history
+                WHERE recorded_at >= ? AND recorded_at < ?
+            """, (start, cutoff))
+            first = cursor.fetchone()["first"]
+            if first is None:
+                return months
+            months.append(first[:7])
+            start = self._month_bounds(first[:7])[1]
+
+    def archive(self, keep_months: int = 3, vacuum: bool = True) -> Dict[str, Any]:
+        """
+        Archive all cold partitions and remove them from the live table.
+
+        Args:
+            keep_months: Number of most recent months to keep in SQLite
+            vacuum: Whether to VACUUM the database afterwards to reclaim space
+
+        Returns:
+            Dictionary with the archived partitions and row count
+        """
+        results = {"partitions": [], "rows": 0, "errors": []}
+
+        if not self.available:
+            results["errors"].append("Neither pyarrow nor numpy is installed")
+            return results
+
+        for month in self.cold_partitions(keep_months):
+            try:
+                rows = self._archive_partition(month)
+            except Exception as e:
+                results["errors"].append(f"{month}: {e}")
+                continue
+
+            results["partitions"].append(month)
+            results["rows"] += rows
+
+        if vacuum and results["rows"]:
+            self.db.conn.execute("VACUUM")
+
+        return results
+
+    def get_price_history(self, scryfall_id: str,
+                          card_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the full price history of a printing from archive and live table.
+
+        Args:
+            scryfall_id: Scryfall ID of the printing
+            card_name: Name of the card, used to match parts archived
+                before history was tracked per printing
+
+        Returns:
+            List of history rows ordered by recorded_at
+        """
+        history = []
+
+        for part in self._parts():
+            history.extend(self._read_card(part, scryfall_id, card_name))
+
+        # Rows of an interrupted archive run are both archived and live
+        archived_ids = {row["id"] for row in history}
+
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT id, card_name, scryfall_id, price, price_type, recorded_at
+            FROM price_history
+            WHERE scryfall_id = ?
+            ORDER BY recorded_at
+        """, (scryfall_id,))
+        history.extend(
+            dict(row) for row in cursor.fetchall() if row["id"] not in archived_ids
+        )
+
+        history.sort(key=lambda row: row["recorded_at"])
+        return history
+
+    def get_price_history_page(self, scryfall_id: Optional[str], card_name: Optional[str] = None,
+                               before_id: Optional[int] = None,
+                               limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Get one page of a printing's price history, newest first.
+
+        Pages are keyed by history id like
+        CardDatabase.get_price_history_page, and continue into the archive
+        once the live table is exhausted. Archived rows keep their original
+        ids; rows archived before ids were kept get negative ids below
+        every real one.
+
+        Args:
+            scryfall_id: Scryfall ID of the printing, or None for an entry
+                added before printings were tracked
+            card_name: Name of the card, used to match rows archived
+                before history was tracked per printing
+            before_id: Only return rows older than this history id
+                (None for the newest page)
+            limit: Maximum number of rows to return
+
+        Returns:
+            List of history rows ordered by id descending
+        """
+        rows = self.db.get_price_history_page(scryfall_id, before_id, limit, card_name)
+        if len(rows) >= limit:
+            return rows
+
+        # The live table has nothing older, so fill the page from the archive
+        live_ids = {row["id"] for row in rows}
+        rows.extend(
+            row for row in self._archived_page_rows(scryfall_id, card_name)
+            if (before_id is None or row["id"] < before_id) and row["id"] not in live_ids
+        )
+        rows.sort(key=lambda row: row["id"], reverse=True)
+        return rows[:limit]
+
+    def iter_columns(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over price history as column batches, archive first.
+
+        Archived batches are backed by memory-mapped files where the
+        backend allows it, so scanning every card's history does not copy
+        the archive into memory. The final batch holds the rows still in
+        the live table. Every batch has the same keys and types whatever
+        the backend:
+
+        - ``card_name``, ``scryfall_id``, ``price_type``: ``(codes,
+          values)`` pairs of an int32 array and the list of strings it
+          indexes (None for missing values)
+        - ``price``: float64 array
+        - ``recorded_at``: datetime64[s] array
+        - ``id``: int64 array of history ids, or None for parts archived
+          before ids were kept
+
+        Yields:
+            Column batch dictionaries
+        """
+        if np is None:
+            raise RuntimeError("numpy is required to scan price history columns")
+
+        archived_max_ids = {}
+        for part in self._parts():
+            batch = self._read_columns(part)
+            month = part.parent.name[len("month="):]
+            if batch["id"] is not None and len(batch["id"]):
+                archived_max_ids[month] = max(
+                    archived_max_ids.get(month, 0), int(batch["id"].max())
+                )
+            yield batch
+
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT id, card_name, scryfall_id, price, price_type, recorded_at
+            FROM price_history
+            ORDER BY recorded_at
+        """)
+        # Skip rows left behind by an interrupted archive run
+        rows = [
+            row for row in cursor.fetchall()
+            if row["id"] > archived_max_ids.get(row["recorded_at"][:7], 0)
+        ]
+        if not rows:
+            return
+
+        batch = {
+            "id": np.array([row["id"] for row in rows], dtype=np.int64),
+            "price": np.array([row["price"] for row in rows], dtype=np.float64),
+            "recorded_at": np.array(
+                [self._parse_timestamp(row["recorded_at"]) for row in rows],
+                dtype="datetime64[s]"
+            ),
+        }
+        for name in STRING_COLUMNS:
+            values: Dict[Optional[str], int] = {}
+            codes = np.array(
+                [values.setdefault(row[name], len(values)) for row in rows], dtype=np.int32
+            )
+            batch[name] = (codes, list(values))
+        yield batch
+
+    def _archived_page_rows(self, scryfall_id: Optional[str],
+                            card_name: Optional[str]) -> List[Dict[str, Any]]:
+        """Get a printing's archived rows in page format, cached per archive state."""
+        parts = self._parts()
+        key = (scryfall_id, card_name, tuple(parts))
+        if key in self._page_cache:
+            self._page_cache.move_to_end(key)
+            return self._page_cache[key]
+
+        archived = []
+        for part in parts:
+            archived.extend(self._read_card(part, scryfall_id, card_name))
+
+        legacy = sorted(
+            (row for row in archived if row["id"] is None),
+            key=lambda row: row["recorded_at"]
+        )
+        for i, row in enumerate(legacy):
+            row["id"] = i - len(legacy)
+
+        rows = [
+            {
+                "id": row["id"],
+                "price": row["price"],
+                "price_type": row["price_type"],
+                "recorded_at": row["recorded_at"],
+            }
+            for row in archived
+        ]
+        self._page_cache[key] = rows
+        if len(self._page_cache) > self.PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+        return rows
+
+    def _cutoff_month(self, keep_months: int) -> str:
+        """Get the first month (YYYY-MM) that stays in the live table."""
+        now = datetime.now(timezone.utc)
+        month_index = now.year * 12 + (now.month - 1) - max(keep_months - 1, 0)
+        return f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+    def _month_bounds(self, month: str) -> Tuple[str, str]:
+        """Get the half-open recorded_at range [start, end) of a month."""
+        year, month_number = (int(part) for part in month.split("-"))
+        year, month_number = (year + 1, 1) if month_number == 12 else (year, month_number + 1)
+        return f"{month}-01", f"{year:04d}-{month_number:02d}-01"
+
+    def _archive_partition(self, month: str) -> int:
+        """Write one month to the archive and delete it from SQLite."""
+        month_dir = self.archive_dir / f"month={month}"
+        start, end = self._month_bounds(month)
+        cursor = self.db.conn.cursor()
+
+        # A previous run may have written its part but not deleted the rows
+        archived_max_id = self._archived_max_id(month_dir)
+        if archived_max_id is not None:
+            cursor.execute("""
+                DELETE FROM price_history
+                WHERE recorded_at >= ? AND recorded_at < ? AND id <= ?
+            """, (start, end, archived_max_id))
+            self.db.conn.commit()
+
+        cursor.execute("""
+            SELECT id, card_name, scryfall_id, price, price_type, recorded_at
+            FROM price_history
+            WHERE recorded_at >= ? AND recorded_at < ?
+            ORDER BY id
+        """, (start, end))
+        rows = cursor.fetchall()
+
+        if not rows:
+            return 0
+
+        month_dir.mkdir(parents=True, exist_ok=True)
+        part_name = f"part-{self._next_part_number(month_dir):05d}"
+
+        if pa is not None:
+            self._write_arrow(month_dir / f"{part_name}.arrow", rows)
+        else:
+            self._write_numpy(month_dir / part_name, rows)
+
+        # Only drop the live rows once the partition is safely on disk, and
+        # only the rows that were written (not ones added since the SELECT)
+        cursor.execute("""
+            DELETE FROM price_history
+            WHERE recorded_at >= ? AND recorded_at < ? AND id <= ?
+        """, (start, end, rows[-1]["id"]))
+        self.db.conn.commit()
+
+        return len(rows)
+
+    def _archived_max_id(self, month_dir: Path) -> Optional[int]:
+        """Get the highest history id already archived for a month."""
+        max_id = None
+        for part in self._month_parts(month_dir):
+            ids = self._read_columns(part)["id"]
+            if ids is None or not len(ids):
+                continue
+            part_max = int(ids.max())
+            if max_id is None or part_max > max_id:
+                max_id = part_max
+        return max_id
+
+    def _next_part_number(self, month_dir: Path) -> int:
+        """Get the number of the next part, ignoring unfinished .tmp parts."""
+        numbers = [int(part.stem.split("-")[1]) for part in self._month_parts(month_dir)]
+        return max(numbers) + 1 if numbers else 0
+
+    def _write_arrow(self, path: Path, rows: List[Any]):
+        """Write rows to an uncompressed Arrow IPC file as one record batch."""
+        table = pa.table({
+            "id": pa.array([row["id"] for row in rows], pa.int64()),
+            "card_name": pa.array([row["card_name"] for row in rows]).dictionary_encode(),
+            "scryfall_id": pa.array(
+                [row["scryfall_id"] or "" for row in rows]
+            ).dictionary_encode(),
+            "price": pa.array([row["price"] for row in rows], pa.float64()),
+            "price_type": pa.array(
+                [row["price_type"] or "" for row in rows]
+            ).dictionary_encode(),
+            "recorded_at": pa.array(
+                [self._parse_timestamp(row["recorded_at"]) for row in rows],
+                pa.timestamp("s")
+            ),
+        })
+
+        tmp_path = path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=len(rows))
+        tmp_path.replace(path)
+
+    def _write_numpy(self, path: Path, rows: List[Any]):
+        """Write rows as a directory of .npy column files."""
+        card_names = sorted({row["card_name"] for row in rows})
+        scryfall_ids = sorted({row["scryfall_id"] or "" for row in rows})
+        price_types = sorted({row["price_type"] or "" for row in rows})
+        card_codes = {name: i for i, name in enumerate(card_names)}
+        id_codes = {scryfall_id: i for i, scryfall_id in enumerate(scryfall_ids)}
+        type_codes = {name: i for i, name in enumerate(price_types)}
+
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.mkdir(parents=True, exist_ok=True)
+
+        np.save(tmp_path / "id.npy", np.array(
+            [row["id"] for row in rows], dtype=np.int64
+        ))
+        np.save(tmp_path / "card_name.npy", np.array(
+            [card_codes[row["card_name"]] for row in rows], dtype=np.int32
+        ))
+        np.save(tmp_path / "scryfall_id.npy", np.array(
+            [id_codes[row["scryfall_id"] or ""] for row in rows], dtype=np.int32
+        ))
+        np.save(tmp_path / "price.npy", np.array(
+            [row["price"] for row in rows], dtype=np.float64
+        ))
+        np.save(tmp_path / "price_type.npy", np.array(
+            [type_codes[row["price_type"] or ""] for row in rows], dtype=np.int32
+        ))
+        np.save(tmp_path / "recorded_at.npy", np.array(
+            [self._parse_timestamp(row["recorded_at"]) for row in rows],
+            dtype="datetime64[s]"
+        ))
+
+        with open(tmp_path / "dictionary.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "card_name": card_names,
+                "scryfall_id": scryfall_ids,
+                "price_type": price_types,
+            }, f)
+
+        tmp_path.replace(path)
+
+    def _parts(self) -> List[Path]:
+        """List archived parts in chronological order."""
+        if not self.archive_dir.exists():
+            return []
+
+        parts = []
+        for month_dir in sorted(self.archive_dir.glob("month=*")):
+            parts.extend(self._month_parts(month_dir))
+        return parts
+
+    def _month_parts(self, month_dir: Path) -> List[Path]:
+        """List the finished parts of one month."""
+        return [
+            part for part in sorted(month_dir.glob("part-*"))
+            if part.suffix != ".tmp"
+        ]
+
+    def _read_columns(self, part: Path) -> Dict[str, Any]:
+        """Read an archived part as a column batch (see iter_columns)."""
+        if part.suffix in (".arrow", ".parquet"):
+            if part.suffix == ".arrow":
+                # Buffers point straight into the memory-mapped file
+                table = pa.ipc.open_file(pa.memory_map(str(part))).read_all()
+            else:
+                table = pq.read_table(part).unify_dictionaries()
+
+            batch = {
+                "id": (self._to_numpy(table.column("id")).astype(np.int64, copy=False)
+                       if "id" in table.column_names else None),
+                "price": self._to_numpy(table.column("price")).astype(np.float64, copy=False),
+                "recorded_at": self._to_numpy(table.column("recorded_at")).astype(
+                    "datetime64[s]", copy=False
+                ),
+            }
+            for name in STRING_COLUMNS:
+                if name in table.column_names:
+                    batch[name] = self._split_dictionary(table.column(name))
+                else:
+                    # Parts archived before per-printing tracking
+                    batch[name] = (np.zeros(table.num_rows, dtype=np.int32), [None])
+            return batch
+
+        with open(part / "dictionary.json", encoding="utf-8") as f:
+            dictionary = json.load(f)
+
+        batch = {
+            "id": (np.load(part / "id.npy", mmap_mode="r")
+                   if (part / "id.npy").exists() else None),
+            "price": np.load(part / "price.npy", mmap_mode="r"),
+            "recorded_at": np.load(part / "recorded_at.npy", mmap_mode="r"),
+        }
+        for name in STRING_COLUMNS:
+            if (part / f"{name}.npy").exists():
+                batch[name] = (
+                    np.load(part / f"{name}.npy", mmap_mode="r"),
+                    [value or None for value in dictionary[name]],
+                )
+            else:
+                # Parts archived before per-printing tracking
+                batch[name] = (np.zeros(len(batch["price"]), dtype=np.int32), [None])
+        return batch
+
+    def _single_array(self, column):
+        """Get a column as one array, copying only if it has several chunks."""
+        if column.num_chunks == 1:
+            return column.chunk(0)
+        return column.combine_chunks()
+
+    def _to_numpy(self, column):
+        """Convert a numeric column to numpy, zero-copy when possible."""
+        return self._single_array(column).to_numpy(zero_copy_only=False)
+
+    def _split_dictionary(self, column) -> Tuple[Any, List[Optional[str]]]:
+        """Split an Arrow string column into int32 codes and their values."""
+        if not pa.types.is_dictionary(column.type):
+            column = column.dictionary_encode()
+        array = self._single_array(column)
+        values = [value or None for value in array.dictionary.to_pylist()]
+        indices = array.indices
+        if indices.null_count:
+            values.append(None)
+            indices = indices.fill_null(len(values) - 1)
+        return indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False), values
+
+    def _read_card(self, part: Path, scryfall_id: Optional[str],
+                   card_name: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Read the history rows of one printing from an archived part.
+
+        Rows archived before history was tracked per printing have no
+        scryfall_id and are matched by card_name instead.
+        """
+        if part.suffix == ".parquet":
+            has_ids = "scryfall_id" in pq.read_schema(part).names
+            filters = []
+            if has_ids and scryfall_id is not None:
+                filters.append([("scryfall_id", "=", scryfall_id)])
+            if card_name:
+                legacy = [("card_name", "=", card_name)]
+                if has_ids:
+                    legacy.append(("scryfall_id", "=", ""))
+                filters.append(legacy)
+            if not filters:
+                return []
+            table = pq.read_table(part, memory_map=True, filters=filters)
+            return [
+                {
+                    "id": row.get("id"),
+                    "card_name": row["card_name"],
+                    "scryfall_id": row.get("scryfall_id") or scryfall_id,
+                    "price": row["price"],
+                    "price_type": row["price_type"] or None,
+                    "recorded_at": row["recorded_at"].strftime(TIMESTAMP_FORMAT),
+                }
+                for row in table.to_pylist()
+            ]
+
+        batch = self._read_columns(part)
+        id_codes, scryfall_ids = batch["scryfall_id"]
+        name_codes, card_names = batch["card_name"]
+        mask = np.zeros(len(id_codes), dtype=bool)
+        if scryfall_id is not None and scryfall_id in scryfall_ids:
+            mask |= id_codes == scryfall_ids.index(scryfall_id)
+        if card_name in card_names and None in scryfall_ids:
+            mask |= ((id_codes == scryfall_ids.index(None))
+                     & (name_codes == card_names.index(card_name)))
+        if not mask.any():
+            return []
+
+        type_codes, price_types = batch["price_type"]
+        ids = batch["id"][mask] if batch["id"] is not None else [None] * int(mask.sum())
+
+        return [
+            {
+                "id": int(row_id) if row_id is not None else None,
+                "card_name": card_names[int(name)],
+                "scryfall_id": scryfall_id,
+                "price": float(price),
+                "price_type": price_types[int(price_type)],
+                "recorded_at": str(timestamp).replace("T", " "),
+            }
+            for row_id, name, price, price_type, timestamp
+            in zip(ids, name_codes[mask], batch["price"][mask], type_codes[mask],
+                   batch["recorded_at"][mask])
+        ]
+
+    def _parse_timestamp(self, value: str) -> datetime:
+        """Parse a SQLite timestamp (CURRENT_TIMESTAMP or ISO format)."""
+        return datetime.fromisoformat(value).replace(microsecond=0, tzinfo=None)
@@ -2,7 +2,7 @@
 import sqlite3
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 class CardDatabase:
@@ -21,12 +21,12 @@ class CardDatabase:
         """Create necessary tables if they don't exist."""
         cursor = self.conn.cursor()
         
-        # Watchlist table
+        # Watchlist table (one row per tracked printing)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS watchlist (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                card_name TEXT NOT NULL UNIQUE,
-                scryfall_id TEXT,
+                card_name TEXT NOT NULL,
+                scryfall_id TEXT UNIQUE,
                 set_name TEXT,
                 set_code TEXT,
                 collector_number TEXT,
@@ -45,10 +45,25 @@ class CardDatabase:
                 price REAL NOT NULL,
                 price_type TEXT,
                 recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (card_name) REFERENCES watchlist(card_name)
+                scryfall_id TEXT,
+                FOREIGN KEY (scryfall_id) REFERENCES watchlist(scryfall_id)
             )
         """)
         
+        self._migrate_to_printings(cursor)
+        
+        # Index for per-printing history lookups (keyset pagination by id)
+        cursor.execute("DROP INDEX IF EXISTS idx_price_history_card")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_price_history_printing
+            ON price_history (scryfall_id, id)
+        """)
+        # Index for time-range scans (archiving months, changes since a time)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_price_history_recorded_at
+            ON price_history (recorded_at)
+        """)
+        
         # App metadata table (for tracking last check time)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS app_metadata (
@@ -60,15 +75,94 @@ class CardDatabase:
         
         self.conn.commit()
     
+    def _migrate_to_printings(self, cursor):
+        """
+        Migrate databases that tracked cards by name to track printings.
+        
+        Older databases have a UNIQUE card_name in the watchlist and no
+        scryfall_id in the price history. The watchlist is rebuilt without
+        the name constraint, and the price history is rebuilt with its
+        foreign key on scryfall_id instead of card_name. Existing history
+        rows are linked to the printing stored for their card name.
+        """
+        cursor.execute("PRAGMA index_list(watchlist)")
+        for index in cursor.fetchall():
+            if not index["unique"]:
+                continue
+            cursor.execute(f"PRAGMA index_info('{index['name']}')")
+            if [column["name"] for column in cursor.fetchall()] != ["card_name"]:
+                continue
+            
+            cursor.execute("""
+                CREATE TABLE watchlist_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    card_name TEXT NOT NULL,
+                    scryfall_id TEXT UNIQUE,
+                    set_name TEXT,
+                    set_code TEXT,
+                    collector_number TEXT,
+                    current_price REAL,
+                    price_type TEXT,
+                    last_updated TIMESTAMP,
+                    added_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                INSERT INTO watchlist_new
+                SELECT id, card_name, scryfall_id, set_name, set_code, collector_number,
+                       current_price, price_type, last_updated, added_date
+                FROM watchlist
+            """)
+            cursor.execute("DROP TABLE watchlist")
+            cursor.execute("ALTER TABLE watchlist_new RENAME TO watchlist")
+            break
+        
+        cursor.execute("PRAGMA foreign_key_list(price_history)")
+        if "card_name" in [key["from"] for key in cursor.fetchall()]:
+            cursor.execute("PRAGMA table_info(price_history)")
+            has_printings = "scryfall_id" in [column["name"] for column in cursor.fetchall()]
+            
+            cursor.execute("""
+                CREATE TABLE price_history_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    card_name TEXT NOT NULL,
+                    price REAL NOT NULL,
+                    price_type TEXT,
+                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    scryfall_id TEXT,
+                    FOREIGN KEY (scryfall_id) REFERENCES watchlist(scryfall_id)
+                )
+            """)
+            # Keep the history ids, archived parts and pagination rely on them
+            cursor.execute(f"""
+                INSERT INTO price_history_new
+                    (id, card_name, price, price_type, recorded_at, scryfall_id)
+                SELECT id, card_name, price, price_type, recorded_at,
+                       {"scryfall_id" if has_printings else "NULL"}
+                FROM price_history
+            """)
+            cursor.execute("DROP TABLE price_history")
+            cursor.execute("ALTER TABLE price_history_new RENAME TO price_history")
+            
+            if not has_printings:
+                cursor.execute("""
+                    UPDATE price_history
+                    SET scryfall_id = (
+                        SELECT w.scryfall_id FROM watchlist w
+                        WHERE w.card_name = price_history.card_name
+                    )
+                """)
+    
     def add_to_watchlist(self, card_data: Dict[str, Any]) -> bool:
         """
-        Add a card to the watchlist.
+        Add a card printing to the watchlist.
         
         Args:
             card_data: Dictionary containing card information
             
         Returns:
-            True if added successfully, False otherwise
+            True if added successfully, False if this printing is
+            already tracked (or on error)
         """
         try:
             cursor = self.conn.cursor()
@@ -93,24 +187,41 @@ class CardDatabase:
             # Add initial price to history
             if card_data.get("price") is not None:
                 cursor.execute("""
-                    INSERT INTO price_history (card_name, price, price_type)
-                    VALUES (?, ?, ?)
-                """, (card_data["name"], card_data["price"], card_data.get("price_type")))
+                    INSERT INTO price_history (scryfall_id, card_name, price, price_type)
+                    VALUES (?, ?, ?, ?)
+                """, (card_data.get("id"), card_data["name"], card_data["price"],
+                      card_data.get("price_type")))
             
             self.conn.commit()
             return True
         except sqlite3.IntegrityError:
-            # Card already exists in watchlist
+            # Printing already exists in watchlist
             return False
         except Exception as e:
             print(f"Error adding card to watchlist: {e}")
             return False
     
-    def remove_from_watchlist(self, card_name: str) -> bool:
-        """Remove a card from the watchlist."""
+    def remove_from_watchlist(self, scryfall_id: Optional[str],
+                              card_name: Optional[str] = None) -> bool:
+        """
+        Remove a card printing from the watchlist.
+        
+        Args:
+            scryfall_id: Scryfall ID of the printing, or None for an entry
+                added before printings were tracked
+            card_name: Name of the entry, used when scryfall_id is None
+            
+        Returns:
+            True if an entry was removed
+        """
         try:
             cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM watchlist WHERE card_name = ?", (card_name,))
+            if scryfall_id is not None:
+                cursor.execute("DELETE FROM watchlist WHERE scryfall_id = ?", (scryfall_id,))
+            else:
+                cursor.execute("""
+                    DELETE FROM watchlist WHERE card_name = ? AND scryfall_id IS NULL
+                """, (card_name,))
             self.conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
@@ -118,24 +229,24 @@ class CardDatabase:
             return False
     
     def get_watchlist(self) -> List[Dict[str, Any]]:
-        """Get all cards in the watchlist."""
+        """Get all card printings in the watchlist."""
         cursor = self.conn.cursor()
         cursor.execute("""
-            SELECT card_name, set_name, set_code, current_price, price_type, 
-                   last_updated, added_date
+            SELECT scryfall_id, card_name, set_name, set_code, collector_number,
+                   current_price, price_type, last_updated, added_date
             FROM watchlist
-            ORDER BY card_name
+            ORDER BY card_name, set_code, collector_number
         """)
         
         return [dict(row) for row in cursor.fetchall()]
     
-    def update_card_price(self, card_name: str, new_price: float, 
+    def update_card_price(self, scryfall_id: str, new_price: float, 
                          price_type: str) -> bool:
         """
-        Update a card's price in the watchlist and add to history.
+        Update a printing's price in the watchlist and add to history.
         
         Args:
-            card_name: Name of the card
+            scryfall_id: Scryfall ID of the printing
             new_price: New price value
             price_type: Type of price (e.g., "USD", "EUR")
             
@@ -150,14 +261,16 @@ class CardDatabase:
             cursor.execute("""
                 UPDATE watchlist 
                 SET current_price = ?, price_type = ?, last_updated = ?
-                WHERE card_name = ?
-            """, (new_price, price_type, now, card_name))
+                WHERE scryfall_id = ?
+            """, (new_price, price_type, now, scryfall_id))
             
             # Add to price history
             cursor.execute("""
-                INSERT INTO price_history (card_name, price, price_type)
-                VALUES (?, ?, ?)
-            """, (card_name, new_price, price_type))
+                INSERT INTO price_history (scryfall_id, card_name, price, price_type)
+                SELECT scryfall_id, card_name, ?, ?
+                FROM watchlist
+                WHERE scryfall_id = ?
+            """, (new_price, price_type, scryfall_id))
             
             self.conn.commit()
             return True
@@ -165,27 +278,170 @@ class CardDatabase:
             print(f"Error updating card price: {e}")
             return False
     
-    def get_price_changes_since(self, since_time: str) -> List[Dict[str, Any]]:
+    def pin_printing(self, card_name: str, card_data: Dict[str, Any]) -> bool:
+        """
+        Store the printing of a watchlist entry that has no Scryfall ID yet.
+        
+        If that printing is already tracked by another entry, the entry's
+        history is merged into it and the entry is removed.
+        
+        Args:
+            card_name: Name of the watchlist entry
+            card_data: Dictionary containing the resolved card information
+            
+        Returns:
+            True if the entry now tracks the printing, False if it was
+            merged or not found
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT 1 FROM watchlist WHERE scryfall_id = ?", (card_data["id"],))
+            already_tracked = cursor.fetchone() is not None
+            
+            if already_tracked:
+                cursor.execute("""
+                    DELETE FROM watchlist WHERE card_name = ? AND scryfall_id IS NULL
+                """, (card_name,))
+                updated = False
+            else:
+                cursor.execute("""
+                    UPDATE watchlist
+                    SET scryfall_id = ?, set_name = ?, set_code = ?, collector_number = ?
+                    WHERE card_name = ? AND scryfall_id IS NULL
+                """, (
+                    card_data["id"],
+                    card_data.get("set"),
+                    card_data.get("set_code"),
+                    card_data.get("collector_number"),
+                    card_name
+                ))
+                updated = cursor.rowcount > 0
+            
+            cursor.execute("""
+                UPDATE price_history
+                SET scryfall_id = ?
+                WHERE card_name = ? AND scryfall_id IS NULL
+            """, (card_data["id"], card_name))
+            self.conn.commit()
+            return updated
+        except Exception as e:
+            print(f"Error updating card printing: {e}")
+            return False
+    
+    def get_price_history_page(self, scryfall_id: Optional[str], before_id: Optional[int] = None,
+                               limit: int = 500,
+                               card_name: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Get cards whose prices have changed since a given time.
+        Get one page of a printing's price history, newest first.
+        
+        Uses keyset pagination on the history id, so every page is a single
+        index range scan no matter how much history the card has.
         
         Args:
-            since_time: ISO format timestamp
+            scryfall_id: Scryfall ID of the printing, or None for an entry
+                added before printings were tracked
+            before_id: Only return rows older than this history id
+                (None for the newest page)
+            limit: Maximum number of rows to return
+            card_name: Name of the entry, used when scryfall_id is None
             
         Returns:
-            List of cards with price changes
+            List of history rows ordered by id descending
         """
         cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT DISTINCT ph.card_name, w.current_price, w.price_type
-            FROM price_history ph
-            JOIN watchlist w ON ph.card_name = w.card_name
-            WHERE ph.recorded_at > ?
-            ORDER BY ph.card_name
-        """, (since_time,))
+        
+        if scryfall_id is not None:
+            where, params = "scryfall_id = ?", [scryfall_id]
+        else:
+            where, params = "scryfall_id IS NULL AND card_name = ?", [card_name]
+        if before_id is not None:
+            where += " AND id < ?"
+            params.append(before_id)
+        
+        cursor.execute(f"""
+            SELECT id, price, price_type, recorded_at
+            FROM price_history
+            WHERE {where}
+            ORDER BY id DESC
+            LIMIT ?
+        """, (*params, limit))
         
         return [dict(row) for row in cursor.fetchall()]
     
+    def get_price_changes_since(self, since_time: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get printings whose price changed, with the old price and the delta.
+        
+        Each printing's latest recorded price is compared with its last
+        price recorded at or before since_time. Without since_time it is
+        compared with the price before its latest refresh, i.e. the
+        changes found by the most recent refresh.
+        
+        Args:
+            since_time: ISO format timestamp; naive timestamps are taken as
+                local time, like the stored last check time
+            
+        Returns:
+            List of changed printings with old_price, new_price, change
+            and change_pct
+        """
+        cursor = self.conn.cursor()
+        
+        if since_time is not None:
+            baseline = """
+                SELECT scryfall_id, MAX(id) AS id
+                FROM price_history
+                WHERE scryfall_id IS NOT NULL AND recorded_at <= ?
+                GROUP BY scryfall_id
+            """
+            params = (self._to_utc_timestamp(since_time),)
+        else:
+            baseline = """
+                SELECT ph.scryfall_id, MAX(ph.id) AS id
+                FROM price_history ph
+                JOIN latest ON ph.scryfall_id = latest.scryfall_id AND ph.id < latest.id
+                GROUP BY ph.scryfall_id
+            """
+            params = ()
+        
+        # recorded_at is stored as UTC CURRENT_TIMESTAMP text
+        cursor.execute(f"""
+            WITH latest AS (
+                SELECT scryfall_id, MAX(id) AS id
+                FROM price_history
+                WHERE scryfall_id IS NOT NULL
+                GROUP BY scryfall_id
+            ), baseline AS ({baseline})
+            SELECT w.scryfall_id, w.card_name, w.set_code, w.collector_number,
+                   old.price AS old_price, new.price AS new_price,
+                   new.price_type, new.recorded_at
+            FROM latest
+            JOIN baseline ON baseline.scryfall_id = latest.scryfall_id
+            JOIN price_history new ON new.id = latest.id
+            JOIN price_history old ON old.id = baseline.id
+            JOIN watchlist w ON w.scryfall_id = latest.scryfall_id
+            WHERE ABS(new.price - old.price) > 0.01
+            ORDER BY w.card_name, w.set_code, w.collector_number
+        """, params)
+        
+        changes = []
+        for row in cursor.fetchall():
+            change = dict(row)
+            change["change"] = round(change["new_price"] - change["old_price"], 2)
+            change["change_pct"] = (
+                round(change["change"] / change["old_price"] * 100, 1)
+                if change["old_price"] else None
+            )
+            changes.append(change)
+        return changes
+    
+    def _to_utc_timestamp(self, value: str) -> str:
+        """Convert an ISO timestamp to the UTC format of CURRENT_TIMESTAMP."""
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.astimezone()
+        return parsed.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    
     def get_last_check_time(self) -> Optional[str]:
         """Get the last time prices were checked."""
         cursor = self.conn.cursor()
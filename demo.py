@@ -14,6 +14,7 @@ if __name__ == "__main__":
     print("  • Search: Type a card name and press Enter")
     print("  • Add: Select a card from search and click 'Add to Watchlist'")
     print("  • Delete: Select a card in watchlist and press 'D'")
+    print("  • History: Select a card in watchlist and press 'H' or Enter")
     print("  • Refresh: Press 'R' to refresh all prices")
     print("  • Quit: Press 'Q' to exit")
     print("=" * 50)
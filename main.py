@@ -7,8 +7,245 @@ This application allows you to:
 - Track price changes over time
 - View price history and changes since last app start
 """
+import argparse
+import asyncio
+
 from ui.app import run_app
 
 
+def positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Track Magic: The Gathering card prices.")
+    parser.add_argument(
+        "--archive", action="store_true",
+        help="Move cold price history into the columnar archive and exit"
+    )
+    parser.add_argument(
+        "--keep-months", type=int, default=3,
+        help="Months of price history to keep in the live database (default: 3)"
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="Run the local read-only JSON API server instead of the TUI"
+    )
+    parser.add_argument(
+        "--host", default="127.0.0.1",
+        help="Interface for --serve to listen on (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8080,
+        help="Port for --serve to listen on (default: 8080)"
+    )
+    parser.add_argument(
+        "--refresh-interval", type=float, default=60,
+        help="Minutes between price refreshes in --serve mode, 0 to disable (default: 60)"
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Refresh prices once without the TUI, print the changes and exit"
+    )
+    parser.add_argument(
+        "--events-jsonl", metavar="PATH",
+        help="Append price change events to a JSON-lines file"
+    )
+    parser.add_argument(
+        "--events-webhook", metavar="URL",
+        help="POST batches of price change events to a webhook URL"
+    )
+    parser.add_argument(
+        "--events-stdout", action="store_true",
+        help="Print price change events as JSON lines (--check and --serve only)"
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record", metavar="CASSETTE",
+        help="Record all Scryfall responses to a cassette file"
+    )
+    cassette.add_argument(
+        "--replay", metavar="CASSETTE",
+        help="Serve Scryfall responses from a recorded cassette instead of the network"
+    )
+    parser.add_argument(
+        "--replay-speedup", type=positive_float, default=1.0,
+        help="Divide replayed latencies by this factor (default: 1.0)"
+    )
+    parser.add_argument(
+        "--replay-latency", default="recorded",
+        help="Replay latency: recorded, none, fixed:MS, uniform:LOW:HIGH "
+             "or lognormal:MEDIAN_MS:SIGMA (default: recorded)"
+    )
+    parser.add_argument(
+        "--replay-seed", type=int, default=0,
+        help="Random seed for replay latency distributions (default: 0)"
+    )
+    parser.add_argument(
+        "--movers", nargs=2, metavar=("OLD", "NEW"),
+        help="Show market-wide top price movers between two Scryfall bulk-data files and exit"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10,
+        help="Number of gainers and losers to show for --movers (default: 10)"
+    )
+    parser.add_argument(
+        "--movers-by", choices=("change", "change_pct"), default="change",
+        help="Rank --movers by absolute or percentage change (default: change)"
+    )
+    parser.add_argument(
+        "--movers-min-price", type=float, default=0.0,
+        help="Ignore prices below this value for --movers (default: 0)"
+    )
+    parser.add_argument(
+        "--movers-out", metavar="PATH",
+        help="Write the full --movers report, including per-set movers, as JSON"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Profile refreshes, searches and watchlist loads, saving profiles to data/profiles"
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=15,
+        help="Number of hotspots to print at exit with --profile (default: 15)"
+    )
+    return parser.parse_args()
+
+
+def build_transport(args):
+    from api.replay import RecordingTransport, ReplayTransport
+
+    if args.replay:
+        return ReplayTransport(args.replay, speedup=args.replay_speedup,
+                               latency=args.replay_latency, seed=args.replay_seed)
+    if args.record:
+        return RecordingTransport(args.record)
+    return None
+
+
+def build_event_sinks(args):
+    from utils.events import JsonLinesSink, WebhookSink, StdoutSink
+
+    sinks = []
+    if args.events_jsonl:
+        sinks.append(JsonLinesSink(args.events_jsonl))
+    if args.events_webhook:
+        sinks.append(WebhookSink(args.events_webhook))
+    if args.events_stdout and (args.check or args.serve):
+        sinks.append(StdoutSink())
+    return sinks
+
+
+def run_archive(keep_months: int):
+    from database.db import CardDatabase
+    from database.archive import PriceArchive
+
+    db = CardDatabase()
+    try:
+        results = PriceArchive(db).archive(keep_months=keep_months)
+    finally:
+        db.close()
+
+    for error in results["errors"]:
+        print(f"✗ {error}")
+    print(f"✓ Archived {results['rows']} row(s) from {len(results['partitions'])} month(s)")
+
+
+def run_movers(args):
+    import json
+    from utils.bulk_movers import BulkPrices, compute_movers
+
+    old_path, new_path = args.movers
+    print(f"→ Loading {old_path}...")
+    old = BulkPrices.load(old_path)
+    print(f"→ Loading {new_path}...")
+    new = BulkPrices.load(new_path)
+
+    results = compute_movers(old, new, top=args.top, by=args.movers_by,
+                             min_price=args.movers_min_price)
+    print(f"✓ Compared {results['compared']} cards | {results['changed']} price(s) changed")
+
+    for title, movers in (("Top gainers", results["overall"]["gainers"]),
+                          ("Top losers", results["overall"]["losers"])):
+        print()
+        print(f"{title}:")
+        for mover in movers:
+            direction = "↑" if mover["change"] > 0 else "↓"
+            print(f"  {direction} {mover['name']} ({mover['set_code'].upper()}): "
+                  f"${mover['old_price']:.2f} → ${mover['new_price']:.2f} "
+                  f"({mover['change_pct']:+.1f}%) [{mover['price_type']}]")
+
+    if args.movers_out:
+        with open(args.movers_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print()
+        print(f"✓ Wrote report for {len(results['sets'])} set(s) to {args.movers_out}")
+
+
+def run_check(event_sinks, transport=None, profiler=None):
+    from api.scryfall import ScryfallAPI
+    from database.db import CardDatabase
+    from utils.events import EventPipeline
+    from utils.price_checker import PriceChecker
+    from utils.name_index import load_name_index
+
+    from rich.console import Console
+
+    async def check():
+        events = EventPipeline(event_sinks) if event_sinks else None
+        if events:
+            events.start()
+
+        db = CardDatabase()
+        api = ScryfallAPI(transport=transport, name_index=load_name_index())
+        try:
+            last_check = db.get_last_check_time()
+            price_checker = PriceChecker(db, api, events)
+            if profiler:
+                profiler.watchlist_size = lambda: len(db.get_watchlist())
+                profiler.count_requests(api.client)
+                profiler.instrument(price_checker, ["check_and_update_prices"])
+            results = price_checker.check_and_update_prices()
+        finally:
+            api.close()
+            db.close()
+            if events:
+                await events.stop()
+
+        console = Console()
+        console.print(price_checker.format_price_changes(results, last_check))
+        console.print(f"[bold]✓[/] Checked {results['checked']} cards | Updated {results['updated']} prices")
+
+    asyncio.run(check())
+
+
 if __name__ == "__main__":
-    run_app()
+    args = parse_args()
+
+    event_sinks = build_event_sinks(args)
+    transport = build_transport(args)
+    profiler = None
+    if args.profile:
+        from utils.profiling import Profiler
+        profiler = Profiler()
+
+    if args.archive:
+        run_archive(args.keep_months)
+    elif args.movers:
+        run_movers(args)
+    elif args.check:
+        run_check(event_sinks, transport, profiler)
+    elif args.serve:
+        from server.api_server import run_server
+        run_server(args.host, args.port, args.refresh_interval * 60, event_sinks,
+                   transport, profiler)
+    else:
+        run_app(event_sinks, transport, profiler)
+
+    if args.replay:
+        print(transport.summary())
+    if profiler:
+        print(profiler.summary(args.profile_top))
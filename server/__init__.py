@@ -0,0 +1 @@
+"""Server module for the local read-only HTTP API."""
@@ -0,0 +1,348 @@
+"""Local read-only HTTP API serving watchlist and price data as JSON."""
+import asyncio
+import hashlib
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from api.scryfall import ScryfallAPI
+from database.archive import PriceArchive
+from database.db import CardDatabase
+from utils.price_checker import PriceChecker
+from utils.events import EventPipeline
+from utils.name_index import load_name_index
+
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class PriceServer:
+    """
+    Asyncio HTTP server exposing the price database to many clients.
+
+    Reads are served on the event loop from a dedicated SQLite connection.
+    A single background refresher owns its own connection and the shared
+    ScryfallAPI instance, so Scryfall is queried once for all clients.
+
+    Responses are cached per URL until the database changes and carry an
+    ETag; clients polling with If-None-Match get an empty 304 response.
+    """
+
+    MAX_HEADER_BYTES = 16384
+    KEEP_ALIVE_TIMEOUT = 30.0
+    MAX_CACHED_RESPONSES = 4096
+
+    def __init__(self, db_path: str = "data/cards.db", host: str = "127.0.0.1",
+                 port: int = 8080, refresh_interval: float = 3600.0,
+                 cache_ttl: float = 300.0, event_sinks=None, transport=None,
+                 profiler=None):
+        """
+        Initialize the server.
+
+        Args:
+            db_path: Path to the SQLite database
+            host: Interface to listen on
+            port: TCP port to listen on
+            refresh_interval: Seconds between price refreshes (0 disables)
+            cache_ttl: Seconds to cache Scryfall lookups in the shared API
+            event_sinks: Optional sinks receiving price change events
+            transport: Optional httpx transport for the shared ScryfallAPI
+            profiler: Optional Profiler for refreshes and searches
+        """
+        self.db_path = db_path
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval
+
+        self.db = CardDatabase(db_path)
+        # WAL lets the refresher write while readers keep serving
+        self.db.conn.execute("PRAGMA journal_mode=WAL")
+        self.api = ScryfallAPI(cache_ttl=cache_ttl, transport=transport,
+                               name_index=load_name_index())
+        self.events = EventPipeline(event_sinks) if event_sinks else None
+        self.profiler = profiler
+        if profiler:
+            profiler.count_requests(self.api.client)
+            profiler.instrument(self.api, ["search_cards", "search_card_records"])
+
+        # The refresher connection lives on the single worker thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refresher")
+        self._writer_db: Optional[CardDatabase] = None
+        self._price_checker: Optional[PriceChecker] = None
+
+        # Archive reads can touch every archived part, so history pages are
+        # built on their own thread and connection, off the event loop
+        self._history_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        self._history_db: Optional[CardDatabase] = None
+        self._archive: Optional[PriceArchive] = None
+
+        self._data_version: Optional[int] = None
+        self._responses: Dict[str, Tuple[str, bytes]] = {}
+        self._last_refresh: Optional[Dict[str, Any]] = None
+
+    async def serve_forever(self):
+        """Start listening and the refresher, and serve until cancelled."""
+        if self.events:
+            self.events.start()
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        refresher = None
+        if self.refresh_interval > 0:
+            refresher = asyncio.create_task(self._refresh_loop())
+
+        print(f"✓ Serving price data on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if refresher:
+                refresher.cancel()
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self._close_writer)
+            await loop.run_in_executor(self._history_executor, self._close_history)
+            if self.events:
+                await self.events.stop()
+            self._executor.shutdown()
+            self._history_executor.shutdown()
+            self.api.close()
+            self.db.close()
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Run one price refresh on the refresher thread."""
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(self._executor, self._run_refresh)
+        self._last_refresh = {
+            "finished_at": datetime.now().isoformat(),
+            "checked": results["checked"],
+            "updated": results["updated"],
+            "changed": len(results["changed"]),
+        }
+        self._responses.clear()
+        return results
+
+    async def _refresh_loop(self):
+        """Refresh prices periodically."""
+        while True:
+            try:
+                results = await self.refresh()
+                print(f"✓ Refreshed {results['updated']} price(s), "
+                      f"{len(results['changed'])} changed")
+            except Exception as e:
+                print(f"Error refreshing prices: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def _run_refresh(self) -> Dict[str, Any]:
+        """Refresh prices (runs on the refresher thread)."""
+        if self._price_checker is None:
+            self._writer_db = CardDatabase(self.db_path)
+            self._price_checker = PriceChecker(self._writer_db, self.api, self.events)
+            if self.profiler:
+                # Profiled calls run on this thread, so use its connection
+                self.profiler.watchlist_size = lambda: len(self._writer_db.get_watchlist())
+                self.profiler.instrument(self._price_checker, ["check_and_update_prices"])
+        return self._price_checker.check_and_update_prices()
+
+    def _run_search(self, query: str, max_results: int):
+        """Search Scryfall (runs on the refresher thread)."""
+        return self.api.search_cards(query, max_results=max_results)
+
+    def _close_writer(self):
+        """Close the refresher connection (runs on the refresher thread)."""
+        if self._writer_db is not None:
+            self._writer_db.close()
+
+    def _run_history(self, scryfall_id: str, before_id: Optional[int],
+                     limit: int) -> List[Dict[str, Any]]:
+        """Build a history page from live and archived rows (runs on the history thread)."""
+        if self._archive is None:
+            self._history_db = CardDatabase(self.db_path)
+            self._archive = PriceArchive(self._history_db)
+
+        # The name matches rows archived before per-printing tracking
+        card_name = next(
+            (card["card_name"] for card in self._history_db.get_watchlist()
+             if card["scryfall_id"] == scryfall_id),
+            None
+        )
+        return self._archive.get_price_history_page(scryfall_id, card_name, before_id, limit)
+
+    def _close_history(self):
+        """Close the history connection (runs on the history thread)."""
+        if self._history_db is not None:
+            self._history_db.close()
+
+    async def _handle_client(self, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+        """Serve HTTP/1.1 requests on one connection."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), self.KEEP_ALIVE_TIMEOUT
+                    )
+                except asyncio.LimitOverrunError:
+                    self._write_response(writer, 431, b"", {}, keep_alive=False)
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    break
+
+                if len(head) > self.MAX_HEADER_BYTES:
+                    self._write_response(writer, 431, b"", {}, keep_alive=False)
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    self._write_response(writer, 400, b"", {}, keep_alive=False)
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = (version == "HTTP/1.1" and connection != "close") \
+                    or connection == "keep-alive"
+
+                status, body, extra = await self._dispatch(method, target, headers)
+                if method == "HEAD":
+                    extra["Content-Length"] = str(len(body))
+                    body = b""
+                self._write_response(writer, status, body, extra, keep_alive)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str,
+                        headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+        """Route a request and apply conditional caching."""
+        if method not in ("GET", "HEAD"):
+            return 405, b"", {"Allow": "GET, HEAD"}
+
+        self._check_data_version()
+
+        cached = self._responses.get(target)
+        if cached is None:
+            try:
+                status, data = await self._route(target)
+            except ValueError as e:
+                status, data = 400, {"error": str(e)}
+            except Exception as e:
+                print(f"Error handling {method} {target}: {e!r}", file=sys.stderr)
+                status, data = 500, {"error": "Internal server error"}
+
+            body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+            if status != 200:
+                return status, body, {"Content-Type": "application/json"}
+
+            etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+            cached = (etag, body)
+            # Search results are cached by the shared ScryfallAPI instead, and
+            # status includes in-memory counters that change without the DB
+            if not target.startswith(("/search", "/status")):
+                if len(self._responses) >= self.MAX_CACHED_RESPONSES:
+                    self._responses.clear()
+                self._responses[target] = cached
+
+        etag, body = cached
+        extra = {"Content-Type": "application/json", "ETag": etag,
+                 "Cache-Control": "no-cache"}
+
+        if etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+            return 304, b"", extra
+        return 200, body, extra
+
+    async def _route(self, target: str) -> Tuple[int, Any]:
+        """Build the JSON payload for a request target."""
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/watchlist":
+            return 200, self.db.get_watchlist()
+
+        if path.startswith("/history/"):
+            scryfall_id = unquote(path[len("/history/"):])
+            before_id = int(params["before_id"]) if "before_id" in params else None
+            limit = min(int(params.get("limit", 500)), 5000)
+            if limit < 1:
+                raise ValueError("'limit' must be at least 1")
+            return 200, await asyncio.get_running_loop().run_in_executor(
+                self._history_executor, self._run_history, scryfall_id, before_id, limit
+            )
+
+        if path == "/changes":
+            return 200, self.db.get_price_changes_since(params.get("since") or None)
+
+        if path == "/search":
+            query = params.get("q", "").strip()
+            if not query:
+                raise ValueError("Missing search query 'q'")
+            max_results = min(int(params.get("max_results", 10)), 100)
+            loop = asyncio.get_running_loop()
+            return 200, await loop.run_in_executor(
+                self._executor, self._run_search, query, max_results
+            )
+
+        if path == "/suggest":
+            if self.api.name_index is None:
+                return 200, []
+            limit = min(int(params.get("limit", 8)), 50)
+            if limit < 1:
+                raise ValueError("'limit' must be at least 1")
+            return 200, self.api.name_index.suggest(params.get("q", ""), limit)
+
+        if path == "/status":
+            return 200, {
+                "last_check": self.db.get_last_check_time(),
+                "last_refresh": self._last_refresh,
+                "watchlist_size": len(self.db.get_watchlist()),
+                "events_dropped": self.events.dropped if self.events else 0,
+            }
+
+        return 404, {"error": f"Unknown path '{url.path}'"}
+
+    def _check_data_version(self):
+        """Drop cached responses when another connection changed the DB."""
+        data_version = self.db.conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._responses.clear()
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, body: bytes,
+                        headers: Dict[str, str], keep_alive: bool):
+        """Write a complete HTTP response."""
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+        headers.setdefault("Content-Length", str(len(body)))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines.extend(f"{key}: {value}" for key, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8080,
+               refresh_interval: float = 3600.0, event_sinks=None, transport=None,
+               profiler=None):
+    server = PriceServer(host=host, port=port, refresh_interval=refresh_interval,
+                         event_sinks=event_sinks, transport=transport, profiler=profiler)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
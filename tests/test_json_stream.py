@@ -0,0 +1,88 @@
+"""Regression tests for the incremental JSON array parser."""
+import json
+import random
+
+import pytest
+
+from utils.json_stream import iter_json_array
+
+
+def split_at(text, cuts):
+    """Split text into chunks at the given offsets."""
+    bounds = [0] + sorted(cuts) + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def every_split(text):
+    """Yield the text split into two chunks at every possible offset."""
+    for i in range(1, len(text)):
+        yield split_at(text, [i])
+
+
+SCALARS = [
+    -4250.5,
+    1.5e-7,
+    -3.25e+12,
+    12345678901234567890,
+    0,
+    -0.0,
+    True,
+    False,
+    None,
+    "",
+    'quote " and backslash \\',
+    "escapes \n\t\r\b\f /",
+    "unicode é中 \U0001f600",
+    "x,y]}",
+]
+
+
+@pytest.mark.parametrize("value", SCALARS, ids=repr)
+def test_scalar_split_at_every_offset(value):
+    items = [value, value, {"nested": [value]}]
+    text = json.dumps(items)
+    for chunks in every_split(text):
+        assert list(iter_json_array(chunks)) == items, chunks
+
+
+def test_number_fraction_split_from_integer_part():
+    assert list(iter_json_array(["[-42", "50.", "5 , 7]"])) == [-4250.5, 7]
+    assert list(iter_json_array(["[1", "2.", "5e", "1]"])) == [125.0]
+
+
+def test_ascii_escapes_split_at_every_offset():
+    text = json.dumps(["café \U0001f600 \"quoted\"", 1.25], ensure_ascii=True)
+    for chunks in every_split(text):
+        assert list(iter_json_array(chunks)) == ["café \U0001f600 \"quoted\"", 1.25]
+
+
+def test_keyed_array_and_metadata_split_at_every_offset():
+    document = {"object": "list", "total_cards": 12.5e3, "data": [1.5, None, "a"],
+                "has_more": False}
+    text = json.dumps(document)
+    for chunks in every_split(text):
+        meta = {}
+        assert list(iter_json_array(chunks, key="data", meta=meta)) == [1.5, None, "a"]
+        assert meta == {"object": "list", "total_cards": 12.5e3, "has_more": False}
+
+
+def test_random_chunking():
+    rng = random.Random(1234)
+    for _ in range(500):
+        items = [
+            rng.choice([
+                rng.uniform(-1e4, 1e4),
+                rng.randint(-10**6, 10**6),
+                rng.choice(SCALARS),
+                {"prices": {"usd": str(rng.uniform(0, 100)), "tix": None}},
+            ])
+            for _ in range(20)
+        ]
+        text = json.dumps({"data": items, "has_more": False})
+        cuts = rng.sample(range(1, len(text)), rng.randint(1, 40))
+        assert list(iter_json_array(split_at(text, cuts), key="data")) == items
+
+
+def test_truncated_number_at_end_of_stream_is_an_error():
+    with pytest.raises(ValueError):
+        list(iter_json_array(["[1.]"]))
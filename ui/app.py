@@ -1,13 +1,18 @@
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
-from textual.widgets import Header, Footer, Static, DataTable, Input, Button, RichLog
+from textual.widgets import Header, Footer, Static, DataTable, Input, Button, RichLog, OptionList
 from textual.binding import Binding
 from textual import on
 from typing import List, Dict, Any
+from pathlib import Path
+import time
 
-from api.scryfall import ScryfallAPI
+from api.scryfall import ScryfallAPI, CardRecord
 from database.db import CardDatabase
 from utils.price_checker import PriceChecker
+from utils.events import EventPipeline
+from utils.name_index import NameIndex, load_name_index
+from ui.history import PriceHistoryScreen
 
 
 class MTGPriceTracker(App):
@@ -44,6 +49,19 @@ class MTGPriceTracker(App):
         border: solid #606060;
     }
     
+    #search-suggestions {
+        display: none;
+        height: auto;
+        max-height: 10;
+        margin: 0 2;
+        border: solid #606060;
+        background: #262626;
+    }
+    
+    #search-suggestions.visible {
+        display: block;
+    }
+    
     #search-button {
         min-width: 12;
         background: #404040;
@@ -174,15 +192,30 @@ class MTGPriceTracker(App):
         Binding("q", "quit", "Quit", key_display="Q"),
         Binding("r", "refresh_prices", "Refresh Prices", key_display="R"),
         Binding("d", "delete_selected", "Delete Selected", key_display="D"),
+        Binding("h", "show_history", "Price History", key_display="H"),
     ]
     
-    def __init__(self):
+    NAME_INDEX_PATH = "data/card_names.idx"
+    NAME_INDEX_MAX_AGE = 7 * 24 * 3600
+    
+    def __init__(self, event_sinks=None, transport=None, profiler=None):
         super().__init__()
         self.db = CardDatabase()
-        self.api = ScryfallAPI()
-        self.price_checker = PriceChecker(self.db, self.api)
-        self.search_results: List[Dict[str, Any]] = []
+        self.name_index = load_name_index(self.NAME_INDEX_PATH)
+        self.api = ScryfallAPI(transport=transport, name_index=self.name_index)
+        self.events = EventPipeline(event_sinks) if event_sinks else None
+        self.price_checker = PriceChecker(self.db, self.api, self.events)
+        self.search_results: List[CardRecord] = []
         self.selected_watchlist_card: str | None = None
+        self.watchlist_cards: List[Dict[str, Any]] = []
+        self.chosen_suggestion: str | None = None
+        
+        if profiler:
+            profiler.watchlist_size = lambda: len(self.db.get_watchlist())
+            profiler.count_requests(self.api.client)
+            profiler.instrument(self.price_checker, ["check_and_update_prices"])
+            profiler.instrument(self.api, ["search_cards", "search_card_records"])
+            profiler.instrument(self, ["load_watchlist"])
     
     def compose(self) -> ComposeResult:
         yield Header()
@@ -193,6 +226,8 @@ class MTGPriceTracker(App):
                 yield Input(placeholder="Enter card name (e.g., 'Hullbreacher', 'Teferi')...", id="search-input")
                 yield Button("Search", id="search-button", variant="primary")
             
+            yield OptionList(id="search-suggestions")
+            
             with Horizontal(id="content-container"):
                 with Container(id="watchlist-container"):
                     yield Static("Watchlist", classes="section-title")
@@ -225,14 +260,41 @@ class MTGPriceTracker(App):
         search_table.zebra_stripes = True
         search_table.show_cursor = True
         
+        if self.events:
+            self.events.start()
+        
         self.load_watchlist()
         self.check_prices_on_startup()
+        
+        index_path = Path(self.NAME_INDEX_PATH)
+        if self.name_index is None or \
+                time.time() - index_path.stat().st_mtime > self.NAME_INDEX_MAX_AGE:
+            watchlist_names = [card["card_name"] for card in self.db.get_watchlist()]
+            self.run_worker(lambda: self.build_name_index(watchlist_names), thread=True)
+    
+    def build_name_index(self, fallback_names: List[str]):
+        """Rebuild the card name index from Scryfall's catalog (worker thread)."""
+        names = self.api.get_card_names()
+        if not names:
+            if self.name_index is not None:
+                return
+            names = fallback_names
+        
+        index = NameIndex(names)
+        if len(names) > len(fallback_names):
+            index.save(self.NAME_INDEX_PATH)
+        self.call_from_thread(self.set_name_index, index)
+    
+    def set_name_index(self, index: NameIndex):
+        self.name_index = index
+        self.api.name_index = index
     
     def load_watchlist(self):
         watchlist_table = self.query_one("#watchlist-table", DataTable)
         watchlist_table.clear()
         
         watchlist = self.db.get_watchlist()
+        self.watchlist_cards = watchlist
         for card in watchlist:
             price_str = f"${card['current_price']:.2f}" if card['current_price'] else "N/A"
             if card.get('price_type'):
@@ -247,9 +309,13 @@ class MTGPriceTracker(App):
                 except:
                     pass
             
+            set_str = card.get('set_name') or 'N/A'
+            if card.get('collector_number'):
+                set_str += f" #{card['collector_number']}"
+            
             watchlist_table.add_row(
                 card['card_name'],
-                card.get('set_name', 'N/A'),
+                set_str,
                 price_str,
                 last_updated
             )
@@ -279,23 +345,25 @@ class MTGPriceTracker(App):
         if not query:
             return
         
+        self.hide_suggestions()
+        
         log = self.query_one("#price-log", RichLog)
         log.write(f"[bold]→[/] Searching for: {query}")
         
-        results = self.api.search_cards(query, max_results=10)
+        results = self.api.search_card_records(query, max_results=10)
         self.search_results = results
         
         search_table = self.query_one("#search-results-table", DataTable)
         search_table.clear()
         
         for card in results:
-            price_str = f"${card['price']:.2f}" if card['price'] else "N/A"
-            if card.get('price_type'):
-                price_str += f" ({card['price_type']})"
+            price_str = f"${card.price:.2f}" if card.price else "N/A"
+            if card.price_type:
+                price_str += f" ({card.price_type})"
             
             search_table.add_row(
-                card['name'],
-                card.get('set', 'N/A'),
+                card.name,
+                card.set or 'N/A',
                 price_str
             )
         
@@ -308,6 +376,43 @@ class MTGPriceTracker(App):
     async def search_on_enter(self):
         await self.search_cards()
     
+    @on(Input.Changed, "#search-input")
+    def update_suggestions(self, event: Input.Changed):
+        suggestions = self.query_one("#search-suggestions", OptionList)
+        suggestions.clear_options()
+        
+        matches = []
+        # Don't reopen the list for a suggestion that was just picked
+        if self.name_index is not None and len(event.value.strip()) >= 2 \
+                and event.value != self.chosen_suggestion:
+            matches = self.name_index.suggest(event.value)
+        
+        suggestions.add_options(matches)
+        suggestions.set_class(bool(matches), "visible")
+    
+    @on(OptionList.OptionSelected, "#search-suggestions")
+    async def select_suggestion(self, event: OptionList.OptionSelected):
+        search_input = self.query_one("#search-input", Input)
+        self.chosen_suggestion = str(event.option.prompt)
+        search_input.value = self.chosen_suggestion
+        search_input.focus()
+        self.hide_suggestions()
+        await self.search_cards()
+    
+    def on_key(self, event):
+        # Arrow down from the search box moves into the suggestions
+        suggestions = self.query_one("#search-suggestions", OptionList)
+        if event.key == "down" and suggestions.has_class("visible") \
+                and self.focused is self.query_one("#search-input", Input):
+            suggestions.focus()
+            suggestions.highlighted = 0
+            event.stop()
+    
+    def hide_suggestions(self):
+        suggestions = self.query_one("#search-suggestions", OptionList)
+        suggestions.clear_options()
+        suggestions.remove_class("visible")
+    
     @on(Button.Pressed, "#add-button")
     def add_to_watchlist(self):
         search_table = self.query_one("#search-results-table", DataTable)
@@ -327,11 +432,11 @@ class MTGPriceTracker(App):
         
         card = self.search_results[idx]
         
-        if self.db.add_to_watchlist(card):
-            log.write(f"[bold]✓[/] Added '{card['name']}' to watchlist")
+        if self.db.add_to_watchlist(card._asdict()):
+            log.write(f"[bold]✓[/] Added '{card.name}' to watchlist")
             self.load_watchlist()
         else:
-            log.write(f"[bold]⚠[/] '{card['name']}' is already in watchlist")
+            log.write(f"[bold]⚠[/] '{card.name}' ({card.set}) is already in watchlist")
     
     def action_refresh_prices(self):
         log = self.query_one("#price-log", RichLog)
@@ -358,19 +463,42 @@ class MTGPriceTracker(App):
             log.write("[bold]✗[/] No card selected in watchlist")
             return
         
-        row_key = watchlist_table.get_row_at(watchlist_table.cursor_row)
-        card_name = row_key[0]
+        idx = watchlist_table.cursor_row
+        if idx >= len(self.watchlist_cards):
+            return
         
-        if self.db.remove_from_watchlist(card_name):
-            log.write(f"[bold]✓[/] Removed '{card_name}' from watchlist")
+        card = self.watchlist_cards[idx]
+        
+        if self.db.remove_from_watchlist(card['scryfall_id'], card['card_name']):
+            log.write(f"[bold]✓[/] Removed '{card['card_name']}' from watchlist")
             self.load_watchlist()
     
-    def on_unmount(self):
+    @on(DataTable.RowSelected, "#watchlist-table")
+    def open_history(self):
+        self.action_show_history()
+    
+    def action_show_history(self):
+        watchlist_table = self.query_one("#watchlist-table", DataTable)
+        log = self.query_one("#price-log", RichLog)
+        
+        idx = watchlist_table.cursor_row
+        if watchlist_table.row_count == 0 or idx < 0 or idx >= len(self.watchlist_cards):
+            log.write("[bold]✗[/] No card selected in watchlist")
+            return
+        
+        card = self.watchlist_cards[idx]
+        self.push_screen(PriceHistoryScreen(
+            self.db, card['scryfall_id'], card['card_name'], card.get('set_name')
+        ))
+    
+    async def on_unmount(self):
+        if self.events:
+            await self.events.stop()
         self.api.close()
         self.db.close()
 
 
-def run_app():
-    app = MTGPriceTracker()
+def run_app(event_sinks=None, transport=None, profiler=None):
+    app = MTGPriceTracker(event_sinks, transport, profiler)
     app.run()
 
@@ -0,0 +1,150 @@
+from textual.app import ComposeResult
+from textual.screen import Screen
+from textual.containers import Container
+from textual.widgets import Header, Footer, Static, Sparkline
+from textual.binding import Binding
+from typing import List, Tuple
+from datetime import datetime
+
+from database.archive import PriceArchive
+from utils.downsample import lttb
+
+
+class PriceHistoryScreen(Screen):
+    """Drill-down screen showing a single card's price over time."""
+
+    CSS = """
+    #history-container {
+        height: 1fr;
+        border: heavy #505050;
+        background: #262626;
+        padding: 0;
+        margin: 1 1 0 1;
+    }
+
+    #history-title {
+        dock: top;
+        height: 3;
+        content-align: center middle;
+        text-style: bold;
+        background: #353535;
+        color: #e0e0e0;
+        border-bottom: heavy #505050;
+    }
+
+    #history-chart {
+        height: 1fr;
+        background: #1a1a1a;
+        padding: 1 2;
+    }
+
+    #history-chart > .sparkline--max-color {
+        color: #3a7070;
+    }
+
+    #history-chart > .sparkline--min-color {
+        color: #808080;
+    }
+
+    #history-stats {
+        dock: bottom;
+        height: auto;
+        background: #262626;
+        color: #e0e0e0;
+        padding: 1 2;
+        border-top: heavy #505050;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "app.pop_screen", "Back", key_display="Esc"),
+    ]
+
+    PAGE_SIZE = 1000
+
+    def __init__(self, db, scryfall_id: str, card_name: str,
+                 set_name: str | None = None):
+        """
+        Initialize the history screen.
+
+        Args:
+            db: CardDatabase instance
+            scryfall_id: Scryfall ID of the printing to show
+            card_name: Name of the card
+            set_name: Set of the printing, shown in the title
+        """
+        super().__init__()
+        self.history = PriceArchive(db)
+        self.scryfall_id = scryfall_id
+        self.card_name = card_name
+        self.card_title = f"{card_name} ({set_name})" if set_name else card_name
+        # (timestamp, price) pairs, oldest first
+        self.points: List[Tuple[float, float]] = []
+        self.oldest_id: int | None = None
+        self.fully_loaded = False
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+
+        with Container(id="history-container"):
+            yield Static(f"Price History: {self.card_title}", id="history-title")
+            yield Sparkline([], id="history-chart")
+            yield Static("Loading...", id="history-stats")
+
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.load_next_page()
+
+    def on_resize(self) -> None:
+        self.render_chart()
+
+    def load_next_page(self) -> None:
+        """Load the next (older) page of history and redraw the chart."""
+        rows = self.history.get_price_history_page(
+            self.scryfall_id, self.card_name, before_id=self.oldest_id, limit=self.PAGE_SIZE
+        )
+
+        if rows:
+            self.oldest_id = rows[-1]["id"]
+            page = []
+            for row in reversed(rows):
+                try:
+                    timestamp = datetime.fromisoformat(row["recorded_at"]).timestamp()
+                except (TypeError, ValueError):
+                    continue
+                page.append((timestamp, row["price"]))
+            self.points = page + self.points
+
+        self.fully_loaded = len(rows) < self.PAGE_SIZE
+        self.render_chart()
+
+        # Keep loading older pages between frames so the screen stays responsive
+        if not self.fully_loaded:
+            self.call_after_refresh(self.load_next_page)
+
+    def render_chart(self) -> None:
+        """Downsample the loaded history to the chart width and draw it."""
+        chart = self.query_one("#history-chart", Sparkline)
+        stats = self.query_one("#history-stats", Static)
+
+        if not self.points:
+            chart.data = []
+            stats.update("[dim]No price history recorded yet[/]")
+            return
+
+        width = max(chart.content_size.width, 3)
+        chart.data = [price for _, price in lttb(self.points, width)]
+
+        prices = [price for _, price in self.points]
+        first_date = datetime.fromtimestamp(self.points[0][0]).strftime("%Y-%m-%d")
+        last_date = datetime.fromtimestamp(self.points[-1][0]).strftime("%Y-%m-%d")
+        change = prices[-1] - prices[0]
+        change_pct = (change / prices[0]) * 100 if prices[0] else 0.0
+        loading = "" if self.fully_loaded else " [dim](loading older history...)[/]"
+
+        stats.update(
+            f"[bold]{first_date} → {last_date}[/] | "
+            f"Current ${prices[-1]:.2f} | Low ${min(prices):.2f} | High ${max(prices):.2f} | "
+            f"Change {change:+.2f} ({change_pct:+.1f}%) | {len(prices)} point(s){loading}"
+        )
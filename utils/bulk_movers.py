@@ -0,0 +1,207 @@
+"""Market-wide price movers from two Scryfall bulk-data dumps."""
+import gzip
+import uuid
+from typing import Any, Dict, Iterator, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from api.scryfall import PRICE_FIELDS, extract_card_data
+from utils.json_stream import iter_json_array
+
+
+FINISHES = list(PRICE_FIELDS)
+CHUNK_ROWS = 65536
+READ_SIZE = 1 << 20
+
+
+class BulkPrices:
+    """
+    Prices of every card in a bulk-data dump as aligned NumPy arrays.
+
+    Row i of every array describes the same card. Rows are sorted by
+    Scryfall ID so two dumps can be aligned with a merge.
+    """
+
+    def __init__(self, ids, prices, name_codes, names: List[str],
+                 set_codes, sets: List[str]):
+        self.ids = ids                # (n,) S16 raw UUID bytes
+        self.prices = prices          # (n, len(FINISHES)) float32, NaN if missing
+        self.name_codes = name_codes  # (n,) int32 index into names
+        self.names = names
+        self.set_codes = set_codes    # (n,) int32 index into sets
+        self.sets = sets
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, path: str) -> "BulkPrices":
+        """
+        Stream-parse a bulk-data file (.json or .json.gz).
+
+        Cards are decoded one at a time and packed into fixed-size NumPy
+        chunks, so memory use stays proportional to the number of cards
+        rather than the size of the JSON.
+
+        Args:
+            path: Path to a Scryfall bulk-data file
+
+        Returns:
+            BulkPrices for every card in the file
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for bulk-data price diffs")
+
+        names: Dict[str, int] = {}
+        sets: Dict[str, int] = {}
+        chunks = []
+
+        ids = np.empty(CHUNK_ROWS, dtype="S16")
+        prices = np.full((CHUNK_ROWS, len(FINISHES)), np.nan, dtype=np.float32)
+        name_codes = np.empty(CHUNK_ROWS, dtype=np.int32)
+        set_codes = np.empty(CHUNK_ROWS, dtype=np.int32)
+        row = 0
+
+        for card_raw in iter_json_array(_read_chunks(path)):
+            card = extract_card_data(card_raw)
+            if not card["id"]:
+                continue
+
+            ids[row] = uuid.UUID(card["id"]).bytes
+            name_codes[row] = names.setdefault(card["name"] or "", len(names))
+            set_codes[row] = sets.setdefault(card["set_code"] or "", len(sets))
+            raw_prices = card_raw.get("prices") or {}
+            for column, field in enumerate(FINISHES):
+                if raw_prices.get(field):
+                    prices[row, column] = float(raw_prices[field])
+            row += 1
+
+            if row == CHUNK_ROWS:
+                chunks.append((ids, prices, name_codes, set_codes))
+                ids = np.empty(CHUNK_ROWS, dtype="S16")
+                prices = np.full((CHUNK_ROWS, len(FINISHES)), np.nan, dtype=np.float32)
+                name_codes = np.empty(CHUNK_ROWS, dtype=np.int32)
+                set_codes = np.empty(CHUNK_ROWS, dtype=np.int32)
+                row = 0
+
+        chunks.append((ids[:row], prices[:row], name_codes[:row], set_codes[:row]))
+
+        all_ids = np.concatenate([chunk[0] for chunk in chunks])
+        order = np.argsort(all_ids, kind="stable")
+        return cls(
+            all_ids[order],
+            np.concatenate([chunk[1] for chunk in chunks])[order],
+            np.concatenate([chunk[2] for chunk in chunks])[order],
+            list(names),
+            np.concatenate([chunk[3] for chunk in chunks])[order],
+            list(sets),
+        )
+
+
+def compute_movers(old: BulkPrices, new: BulkPrices, top: int = 10,
+                   by: str = "change", min_price: float = 0.0) -> Dict[str, Any]:
+    """
+    Find the biggest price gainers and losers between two dumps.
+
+    Every (card, finish) pair priced in both dumps is compared at once with
+    vectorized array operations.
+
+    Args:
+        old: Prices from the earlier dump
+        new: Prices from the later dump
+        top: Number of gainers and losers to report per group
+        by: Rank by absolute "change" or by percentage "change_pct"
+        min_price: Ignore pairs whose old price is below this value
+
+    Returns:
+        Dictionary with "overall" and per-set "sets" movers, each holding
+        "gainers" and "losers" lists
+    """
+    if by not in ("change", "change_pct"):
+        raise ValueError(f"Unknown ranking: {by}")
+
+    _, old_rows, new_rows = np.intersect1d(
+        old.ids, new.ids, assume_unique=True, return_indices=True
+    )
+    old_prices = old.prices[old_rows]
+    new_prices = new.prices[new_rows]
+
+    change = new_prices - old_prices
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = change / old_prices * 100
+    valid = ~np.isnan(change) & (old_prices > 0) & (old_prices >= min_price)
+
+    # Flatten to one entry per (card, finish) pair that changed
+    pair_rows, pair_finishes = np.nonzero(valid & (change != 0))
+    pair_change = change[pair_rows, pair_finishes]
+    pair_pct = change_pct[pair_rows, pair_finishes]
+    metric = pair_change if by == "change" else pair_pct
+    pair_sets = new.set_codes[new_rows][pair_rows]
+
+    def describe(indices) -> List[Dict[str, Any]]:
+        movers = []
+        for i in indices:
+            row = new_rows[pair_rows[i]]
+            finish = FINISHES[pair_finishes[i]]
+            movers.append({
+                "id": str(uuid.UUID(bytes=bytes(new.ids[row]).ljust(16, b"\0"))),
+                "name": new.names[new.name_codes[row]],
+                "set_code": new.sets[new.set_codes[row]],
+                "finish": finish,
+                "price_type": PRICE_FIELDS[finish],
+                # Prices are stored as float32, so round away the noise
+                "old_price": round(float(old_prices[pair_rows[i], pair_finishes[i]]), 2),
+                "new_price": round(float(new_prices[pair_rows[i], pair_finishes[i]]), 2),
+                "change": round(float(pair_change[i]), 2),
+                "change_pct": round(float(pair_pct[i]), 1),
+            })
+        return movers
+
+    def top_movers(indices) -> Dict[str, List[Dict[str, Any]]]:
+        values = metric[indices]
+        gainers = indices[_top_indices(values, top)]
+        losers = indices[_top_indices(-values, top)]
+        return {
+            "gainers": describe(gainers[metric[gainers] > 0]),
+            "losers": describe(losers[metric[losers] < 0]),
+        }
+
+    results = {
+        "compared": int(len(old_rows)),
+        "changed": int(len(pair_rows)),
+        "overall": top_movers(np.arange(len(pair_rows))),
+        "sets": {},
+    }
+
+    # Group pairs by set with one sort, then rank within each group
+    order = np.argsort(pair_sets, kind="stable")
+    set_ids, starts = np.unique(pair_sets[order], return_index=True)
+    for set_id, group in zip(set_ids, np.split(order, starts[1:])):
+        results["sets"][new.sets[set_id]] = top_movers(group)
+
+    return results
+
+
+def _top_indices(values, n: int):
+    """Indices of the n largest values, largest first."""
+    if len(values) == 0 or n <= 0:
+        return np.array([], dtype=np.intp)
+    if n < len(values):
+        candidates = np.argpartition(values, -n)[-n:]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(values[candidates])[::-1]]
+
+
+def _read_chunks(path: str) -> Iterator[str]:
+    """Read a (possibly gzip-compressed) text file in chunks."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                return
+            yield chunk
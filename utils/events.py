@@ -0,0 +1,214 @@
+"""Price change events and an async fan-out pipeline to pluggable sinks."""
+import asyncio
+import json
+import sys
+import threading
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+@dataclass
+class PriceChangeEvent:
+    """A single detected price change for a watchlist card."""
+
+    card_name: str
+    old_price: float
+    new_price: float
+    change: float
+    change_pct: float
+    price_type: Optional[str]
+    scryfall_id: Optional[str] = None
+    set_code: Optional[str] = None
+    recorded_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the event to a JSON-serializable dictionary."""
+        return asdict(self)
+
+
+class EventSink:
+    """Base class for event sinks. Subclasses implement write_batch()."""
+
+    batch_size = 100
+    batch_interval = 1.0
+    queue_size = 1000
+
+    async def write_batch(self, events: List[PriceChangeEvent]):
+        """Deliver a batch of events."""
+        raise NotImplementedError
+
+    async def close(self):
+        """Release any resources held by the sink."""
+
+
+class JsonLinesSink(EventSink):
+    """Appends events to a JSON-lines file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def write_batch(self, events: List[PriceChangeEvent]):
+        lines = "".join(json.dumps(event.to_dict()) + "\n" for event in events)
+        await asyncio.get_running_loop().run_in_executor(None, self._append, lines)
+
+    def _append(self, lines: str):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class WebhookSink(EventSink):
+    """POSTs batches of events as a JSON array to a webhook URL."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.client = httpx.AsyncClient(timeout=timeout)
+
+    async def write_batch(self, events: List[PriceChangeEvent]):
+        try:
+            response = await self.client.post(
+                self.url, json=[event.to_dict() for event in events]
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            print(f"Error sending events to webhook: {e}", file=sys.stderr)
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class StdoutSink(EventSink):
+    """Prints events to stdout as JSON lines."""
+
+    batch_interval = 0.1
+
+    async def write_batch(self, events: List[PriceChangeEvent]):
+        for event in events:
+            print(json.dumps(event.to_dict()), flush=True)
+
+
+class EventPipeline:
+    """
+    Bounded async queue fanning price change events out to sinks.
+
+    publish() never blocks: it may be called from the event loop or from a
+    worker thread, and events are dropped (and counted in ``dropped``) only
+    when the main queue is full. Each sink has its own bounded queue and
+    delivery task; the dispatcher waits for room in a full sink queue, so
+    a slow sink applies backpressure to the main queue instead of losing
+    events.
+    """
+
+    def __init__(self, sinks: List[EventSink], queue_size: int = 10000):
+        """
+        Initialize the pipeline.
+
+        Args:
+            sinks: Sinks to deliver events to
+            queue_size: Maximum number of undispatched events
+        """
+        self.sinks = sinks
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._sink_queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Start dispatching. Must be called from the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._sink_queues = [asyncio.Queue(maxsize=sink.queue_size) for sink in self.sinks]
+        self._tasks = [self._loop.create_task(self._dispatch())]
+        for sink, queue in zip(self.sinks, self._sink_queues):
+            self._tasks.append(self._loop.create_task(self._deliver(sink, queue)))
+
+    def publish(self, event: PriceChangeEvent):
+        """Queue an event for delivery without blocking the caller."""
+        if self._loop is None or self._loop.is_closed():
+            return
+
+        if self._thread_id == threading.get_ident():
+            self._put(event)
+        else:
+            self._loop.call_soon_threadsafe(self._put, event)
+
+    async def stop(self, timeout: float = 5.0):
+        """Flush queued events to the sinks and shut the pipeline down."""
+        if self._loop is None:
+            return
+
+        undelivered = 0
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            undelivered = self._queue.qsize() + sum(q.qsize() for q in self._sink_queues)
+
+        if self.dropped:
+            print(f"Dropped {self.dropped} price change event(s): event queue was full",
+                  file=sys.stderr)
+        if undelivered:
+            print(f"{undelivered} queued price change event(s) not delivered "
+                  f"within {timeout:.0f}s", file=sys.stderr)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        for sink in self.sinks:
+            await sink.close()
+        self._loop = None
+
+    def _put(self, event: PriceChangeEvent) -> bool:
+        """Put an event on the main queue, dropping it when the queue is full."""
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _drain(self):
+        """Wait until every queued event has been delivered."""
+        await self._queue.join()
+        for queue in self._sink_queues:
+            await queue.join()
+
+    async def _dispatch(self):
+        """Copy events from the main queue to every sink queue."""
+        while True:
+            event = await self._queue.get()
+            for queue in self._sink_queues:
+                # Waits while a sink is behind, so events back up in the
+                # main queue rather than being dropped
+                await queue.put(event)
+            self._queue.task_done()
+
+    async def _deliver(self, sink: EventSink, queue: asyncio.Queue):
+        """Collect events into batches and hand them to a sink."""
+        while True:
+            batch = [await queue.get()]
+            deadline = self._loop.time() + sink.batch_interval
+
+            while len(batch) < sink.batch_size:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await sink.write_batch(batch)
+            except Exception as e:
+                print(f"Error delivering events to {type(sink).__name__}: {e}",
+                      file=sys.stderr)
+            finally:
+                for _ in batch:
+                    queue.task_done()
@@ -0,0 +1,127 @@
+"""Incremental parsing of large JSON arrays from a stream of text chunks."""
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",:]}" + _WHITESPACE
+
+
+class _Buffer:
+    """Text buffer refilled from an iterator of chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, returning False at end of stream."""
+        if self.eof:
+            return False
+        for chunk in self.chunks:
+            if chunk:
+                # Drop consumed text so the buffer stays bounded
+                self.text = self.text[self.pos:] + chunk
+                self.pos = 0
+                return True
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        """Consume one expected character."""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} in JSON stream")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # Objects, arrays and strings end with a closing character,
+                # but a number cut by a chunk boundary also decodes (e.g. the
+                # "-4250" of "-4250." | "5"), so only accept a scalar once a
+                # delimiter follows it or the stream is exhausted
+                if (isinstance(value, (dict, list, str)) or self.eof
+                        or (end < len(self.text) and self.text[end] in _DELIMITERS)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                pass
+            if not self.fill():
+                value, self.pos = _decoder.raw_decode(self.text, self.pos)
+                return value
+
+
+def iter_json_array(chunks: Iterable[str], key: Optional[str] = None,
+                    meta: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array one at a time while reading a stream.
+
+    Only one item is held in memory at a time, and the caller can stop
+    iterating (and close the underlying stream) before the end.
+
+    Args:
+        chunks: Iterable of text chunks, e.g. response.iter_text()
+        key: Key of the array inside a top-level object, or None when the
+            document itself is an array
+        meta: Optional dictionary filled with the other top-level fields
+            of the object (fields after the array are only available once
+            the array has been fully consumed)
+
+    Yields:
+        Decoded array items
+    """
+    buffer = _Buffer(chunks)
+
+    if key is None:
+        yield from _iter_items(buffer)
+        return
+
+    buffer.expect("{")
+    while buffer.peek() != "}":
+        name = buffer.value()
+        buffer.expect(":")
+
+        if name == key and buffer.peek() == "[":
+            yield from _iter_items(buffer)
+        else:
+            value = buffer.value()
+            if meta is not None:
+                meta[name] = value
+
+        if buffer.peek() == ",":
+            buffer.pos += 1
+        elif buffer.peek() != "}":
+            raise ValueError(f"Expected ',' or '}}' at offset {buffer.pos} in JSON stream")
+
+
+def _iter_items(buffer: _Buffer) -> Iterator[Any]:
+    """Yield the items of the array starting at the buffer position."""
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        buffer.pos += 1
+        return
+
+    while True:
+        yield buffer.value()
+        char = buffer.peek()
+        buffer.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise ValueError(f"Expected ',' or ']' at offset {buffer.pos - 1} in JSON stream")
@@ -0,0 +1,225 @@
+"""In-memory card name index for autocomplete and offline fuzzy matching."""
+import struct
+import unicodedata
+import zlib
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+
+MAGIC = b"MTGNIDX1"
+HEADER = struct.Struct("<8sIIII")
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a card name: lowercase, no accents or punctuation."""
+    decomposed = unicodedata.normalize("NFKD", name.lower())
+    chars = [c if c.isalnum() else " " for c in decomposed if not unicodedata.combining(c)]
+    return " ".join("".join(chars).split())
+
+
+def _deletes(key: str) -> Set[str]:
+    """All strings obtained by deleting one character from key."""
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def _hash(key: str) -> int:
+    return zlib.crc32(key.encode("utf-8"))
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between two strings.
+
+    Returns max_distance + 1 as soon as the distance is known to exceed
+    max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class NameIndex:
+    """
+    Card name index with prefix search and typo-tolerant lookup.
+
+    Normalized names are kept in a sorted list, so prefix completion is a
+    binary search. Typos are handled with a symmetric-delete index: every
+    name and its one-character deletions are hashed into a sorted array,
+    and a query probes the same array with its own deletions. Candidates
+    are verified with an edit distance check.
+
+    The index is saved as a flat binary file that loads without rebuilding.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Build an index.
+
+        Args:
+            names: Card names to index (duplicates are ignored)
+        """
+        by_key: Dict[str, str] = {}
+        for name in names:
+            key = normalize_name(name)
+            if key:
+                by_key.setdefault(key, name)
+
+        self.keys: List[str] = sorted(by_key)
+        self.names: List[str] = [by_key[key] for key in self.keys]
+
+        pairs = []
+        for i, key in enumerate(self.keys):
+            for variant in _deletes(key) | {key}:
+                pairs.append((_hash(variant), i))
+        pairs.sort()
+        self.hashes = array("I", (h for h, _ in pairs))
+        self.ids = array("I", (i for _, i in pairs))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def prefix(self, text: str, limit: int = 10) -> List[str]:
+        """
+        Get names starting with the given text.
+
+        Args:
+            text: Typed text
+            limit: Maximum number of names to return
+
+        Returns:
+            Matching card names in alphabetical order
+        """
+        key = normalize_name(text)
+        if not key:
+            return []
+
+        results = []
+        i = bisect_left(self.keys, key)
+        while i < len(self.keys) and len(results) < limit and self.keys[i].startswith(key):
+            results.append(self.names[i])
+            i += 1
+        return results
+
+    def fuzzy(self, text: str, max_distance: int = 2, limit: int = 10) -> List[str]:
+        """
+        Get names within a small edit distance of the given text.
+
+        Every name within distance 1 is found. Distance 2 matches are found
+        when at most one of the edits is on the name side (e.g. a missing
+        or extra letter plus one other typo).
+
+        Args:
+            text: Typed (possibly misspelled) name
+            max_distance: Maximum edit distance to accept
+            limit: Maximum number of names to return
+
+        Returns:
+            Matching card names, closest first
+        """
+        key = normalize_name(text)
+        if not key:
+            return []
+
+        variants = _deletes(key) | {key}
+        if max_distance >= 2 and len(key) <= 24:
+            for variant in list(variants):
+                variants |= _deletes(variant)
+
+        candidates = set()
+        for variant in variants:
+            h = _hash(variant)
+            i = bisect_left(self.hashes, h)
+            while i < len(self.hashes) and self.hashes[i] == h:
+                candidates.add(self.ids[i])
+                i += 1
+
+        scored = []
+        for i in candidates:
+            distance = edit_distance(key, self.keys[i], max_distance)
+            if distance <= max_distance:
+                scored.append((distance, self.keys[i], self.names[i]))
+        scored.sort()
+        return [name for _, _, name in scored[:limit]]
+
+    def suggest(self, text: str, limit: int = 8) -> List[str]:
+        """Autocomplete suggestions: prefix matches, then fuzzy matches."""
+        results = self.prefix(text, limit)
+        if len(results) < limit:
+            for name in self.fuzzy(text, limit=limit):
+                if name not in results:
+                    results.append(name)
+                    if len(results) == limit:
+                        break
+        return results
+
+    def exact(self, text: str) -> Optional[str]:
+        """Get the card name whose normalized form equals the text, if any."""
+        key = normalize_name(text)
+        i = bisect_left(self.keys, key)
+        if key and i < len(self.keys) and self.keys[i] == key:
+            return self.names[i]
+        return None
+
+    def save(self, path: str):
+        """Write the index to a compact binary file."""
+        keys_blob = "\n".join(self.keys).encode("utf-8")
+        names_blob = "\n".join(self.names).encode("utf-8")
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self.keys), len(self.hashes),
+                                len(keys_blob), len(names_blob)))
+            f.write(keys_blob)
+            f.write(names_blob)
+            f.write(self.hashes.tobytes())
+            f.write(self.ids.tobytes())
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str) -> "NameIndex":
+        """Load an index written by save()."""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, n_names, n_hashes, keys_len, names_len = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"Not a card name index: {path}")
+
+        index = cls.__new__(cls)
+        offset = HEADER.size
+        index.keys = data[offset:offset + keys_len].decode("utf-8").split("\n") if n_names else []
+        offset += keys_len
+        index.names = data[offset:offset + names_len].decode("utf-8").split("\n") if n_names else []
+        offset += names_len
+
+        index.hashes = array("I")
+        index.hashes.frombytes(data[offset:offset + n_hashes * 4])
+        offset += n_hashes * 4
+        index.ids = array("I")
+        index.ids.frombytes(data[offset:offset + n_hashes * 4])
+        return index
+
+
+def load_name_index(path: str = "data/card_names.idx") -> Optional[NameIndex]:
+    """Load the saved card name index, or None if it is missing or invalid."""
+    try:
+        return NameIndex.load(path)
+    except (OSError, ValueError, struct.error):
+        return None
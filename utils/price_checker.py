@@ -2,20 +2,25 @@
 from typing import List, Dict, Any
 from datetime import datetime
 
+from utils.events import PriceChangeEvent
+
 
 class PriceChecker:
     """Handles price checking and change detection."""
     
-    def __init__(self, db, api):
+    def __init__(self, db, api, events=None):
         """
         Initialize price checker.
         
         Args:
             db: CardDatabase instance
             api: ScryfallAPI instance
+            events: Optional EventPipeline that receives a PriceChangeEvent
+                for every detected change
         """
         self.db = db
         self.api = api
+        self.events = events
     
     def check_and_update_prices(self) -> Dict[str, Any]:
         """
@@ -37,11 +42,25 @@ class PriceChecker:
         # Get last check time before updating
         last_check = self.db.get_last_check_time()
         
-        card_names = [card["card_name"] for card in watchlist]
-        updated_cards = self.api.get_cards_by_names(card_names)
+        # Printings are fetched by exact Scryfall ID, no name matching
+        old_prices = {
+            card["scryfall_id"]: card.get("current_price")
+            for card in watchlist if card["scryfall_id"]
+        }
+        updated_cards = self.api.get_cards_by_ids(list(old_prices))
+        
+        # Entries from before printings were tracked get pinned to the
+        # printing their name resolves to, once
+        for old_card in watchlist:
+            if old_card["scryfall_id"]:
+                continue
+            card = self.api.get_card_by_name(old_card["card_name"])
+            if card and card.get("id") and self.db.pin_printing(old_card["card_name"], card):
+                old_prices[card["id"]] = old_card.get("current_price")
+                updated_cards.append(card)
         
         results = {
-            "checked": len(card_names),
+            "checked": len(watchlist),
             "updated": 0,
             "changed": [],
             "errors": []
@@ -51,29 +70,41 @@ class PriceChecker:
             if card.get("price") is None:
                 continue
             
+            scryfall_id = card["id"]
             card_name = card["name"]
             new_price = card["price"]
             price_type = card.get("price_type", "USD")
-            
-            # Find old price
-            old_card = next((c for c in watchlist if c["card_name"] == card_name), None)
-            old_price = old_card.get("current_price") if old_card else None
+            old_price = old_prices.get(scryfall_id)
             
             # Update price in database
-            if self.db.update_card_price(card_name, new_price, price_type):
+            if self.db.update_card_price(scryfall_id, new_price, price_type):
                 results["updated"] += 1
                 
                 # Check if price changed
                 if old_price is not None and abs(new_price - old_price) > 0.01:
                     change_pct = ((new_price - old_price) / old_price) * 100
                     results["changed"].append({
+                        "scryfall_id": scryfall_id,
                         "name": card_name,
+                        "set_code": card.get("set_code"),
                         "old_price": old_price,
                         "new_price": new_price,
                         "change": new_price - old_price,
                         "change_pct": change_pct,
                         "price_type": price_type
                     })
+                    
+                    if self.events is not None:
+                        self.events.publish(PriceChangeEvent(
+                            card_name=card_name,
+                            old_price=old_price,
+                            new_price=new_price,
+                            change=new_price - old_price,
+                            change_pct=change_pct,
+                            price_type=price_type,
+                            scryfall_id=scryfall_id,
+                            set_code=card.get("set_code")
+                        ))
         
         # Update last check time
         self.db.update_last_check_time()
@@ -116,9 +147,10 @@ class PriceChecker:
                 direction = "↓"
             
             price_type = change.get("price_type", "USD")
+            printing = f" ({change['set_code'].upper()})" if change.get("set_code") else ""
             
             lines.append(
-                f"  {direction} {change['name']}: "
+                f"  {direction} {change['name']}{printing}: "
                 f"${change['old_price']:.2f} → ${change['new_price']:.2f} "
                 f"({change['change_pct']:+.1f}%) [{price_type}]"
             )
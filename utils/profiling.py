@@ -0,0 +1,138 @@
+"""On-demand profiling of refresh and search hot paths."""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Profiler:
+    """
+    Wraps selected methods with cProfile and saves one profile per call.
+
+    Each profiled call is written to ``<output_dir>/<timestamp>-<method>.prof``
+    (loadable with pstats or snakeviz) along with a ``.json`` file holding
+    the duration, the watchlist size and the number of HTTP requests made
+    during the call.
+    """
+
+    def __init__(self, output_dir: str = "data/profiles",
+                 watchlist_size: Optional[Callable[[], int]] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory where profiles are written
+            watchlist_size: Optional callable returning the current
+                watchlist size, recorded with every profile
+        """
+        self.output_dir = Path(output_dir)
+        self.watchlist_size = watchlist_size
+        self.runs: List[Dict[str, Any]] = []
+        self.requests = 0
+        self._active = threading.local()
+
+    def instrument(self, obj: Any, method_names: List[str]):
+        """
+        Profile the given methods of an object from now on.
+
+        Args:
+            obj: Object whose methods are replaced by profiled wrappers
+            method_names: Names of the methods to profile (missing ones
+                are ignored)
+        """
+        for name in method_names:
+            method = getattr(obj, name, None)
+            if method is not None:
+                setattr(obj, name, self._wrap(method, f"{type(obj).__name__}.{name}"))
+
+    def count_requests(self, client):
+        """Count requests made through an httpx.Client."""
+        hooks = client.event_hooks
+        hooks["request"].append(self._on_request)
+        client.event_hooks = hooks
+
+    def summary(self, top: int = 15) -> str:
+        """
+        Summarize all profiled calls and the top hotspots across them.
+
+        Args:
+            top: Number of functions to list, by internal time
+
+        Returns:
+            Printable summary
+        """
+        if not self.runs:
+            return "No profiled calls recorded"
+
+        lines = ["Profiled calls:"]
+        for run in self.runs:
+            lines.append(
+                f"  {run['method']}: {run['duration']:.3f}s, "
+                f"{run['requests']} request(s), watchlist {run['watchlist_size']} "
+                f"-> {run['profile']}"
+            )
+
+        stream = io.StringIO()
+        stats = pstats.Stats(*(run["profile"] for run in self.runs), stream=stream)
+        stats.sort_stats("tottime").print_stats(top)
+        lines.append("")
+        lines.append(f"Top {top} hotspots (by internal time):")
+        lines.append(stream.getvalue().strip())
+        return "\n".join(lines)
+
+    def _on_request(self, request):
+        self.requests += 1
+
+    def _wrap(self, method: Callable, label: str) -> Callable:
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            # Nested profiled calls are covered by the outer profile
+            if getattr(self._active, "running", False):
+                return method(*args, **kwargs)
+
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is already active (e.g. on another thread)
+                return method(*args, **kwargs)
+
+            requests_before = self.requests
+            started_at = datetime.now()
+            start = time.perf_counter()
+            self._active.running = True
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._active.running = False
+                self._save(profile, label, started_at, time.perf_counter() - start,
+                           self.requests - requests_before)
+
+        return profiled
+
+    def _save(self, profile: cProfile.Profile, label: str, started_at: datetime,
+              duration: float, requests: int):
+        """Write a profile and its metadata to the output directory."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = started_at.strftime("%Y%m%d-%H%M%S-%f")
+        path = self.output_dir / f"{stamp}-{label}.prof"
+        profile.dump_stats(path)
+
+        run = {
+            "method": label,
+            "started_at": started_at.isoformat(),
+            "duration": duration,
+            "requests": requests,
+            "watchlist_size": self.watchlist_size() if self.watchlist_size else None,
+            "profile": str(path),
+        }
+        with open(path.with_suffix(".json"), "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        self.runs.append(run)